@@ -1,77 +1,52 @@
-import pigpio
 import time
 import random
-import signal
-import sys
+import pigpio_pool
+from rf_messages import Stopped
 
 GPIO_TX = 20
-pi = pigpio.pi()
 
-if not pi.connected:
-    exit("❌ Run sudo pigpiod first!")
 
-pi.set_mode(GPIO_TX, pigpio.OUTPUT)
+def send_pulse(pi, pulse_duration, hold):
+    # wave_add_new بدل wave_clear: الاتصال مشترك وما نمسح موجات غيرنا
+    pi.wave_add_new()
 
-running = True
+    pulses = [
+        pigpio_pool.pulse(1 << GPIO_TX, 0, pulse_duration),
+        pigpio_pool.pulse(0, 1 << GPIO_TX, pulse_duration)
+    ]
 
-def smooth_shutdown(signal, frame):
-    global running
-    running = False
+    pi.wave_add_generic(pulses)
+    wave_id = pi.wave_create()
 
-signal.signal(signal.SIGINT, smooth_shutdown)
+    if wave_id >= 0:
+        pi.wave_send_repeat(wave_id)
+        time.sleep(hold)
+        pi.wave_delete(wave_id)
 
-def rf_jamming():
-    global running
-    wave_ids = []
 
-    try:
-        while running:
-            pulse_duration = random.randint(50, 500)
-            pi.wave_clear()
+class Jammer:
+    """Random-width square wave on GPIO_TX until `stop` is set, then a slow ramp-down."""
 
-            pulses = [
-                pigpio.pulse(1 << GPIO_TX, 0, pulse_duration),
-                pigpio.pulse(0, 1 << GPIO_TX, pulse_duration)
-            ]
+    def run(self, stop, emit):
+        pi = pigpio_pool.lease("jamming")
+        pi.set_mode(GPIO_TX, pigpio_pool.OUTPUT)
 
-            pi.wave_add_generic(pulses)
-            wave_id = pi.wave_create()
+        try:
+            while not stop.is_set():
+                send_pulse(pi, random.randint(50, 500), 0.01)
 
-            if wave_id >= 0:
-                wave_ids.append(wave_id)
-                pi.wave_send_repeat(wave_id)
-                time.sleep(0.01)
-                pi.wave_delete(wave_id)
+            for i in range(5, 0, -1):
+                send_pulse(pi, i * 200, 0.5)
 
-        for i in range(5, 0, -1):
-            pulse_duration = i * 200
-            pi.wave_clear()
+            emit(Stopped("✅ RF Jamming stopped smoothly. Receiver is safe now."))
+        finally:
+            pi.wave_tx_stop()
+            pi.write(GPIO_TX, 0)
+            pi.release()
 
-            pulses = [
-                pigpio.pulse(1 << GPIO_TX, 0, pulse_duration),
-                pigpio.pulse(0, 1 << GPIO_TX, pulse_duration)
-            ]
-
-            pi.wave_add_generic(pulses)
-            wave_id = pi.wave_create()
-
-            if wave_id >= 0:
-                pi.wave_send_repeat(wave_id)
-                time.sleep(0.5)
-                pi.wave_delete(wave_id)
-
-        pi.wave_tx_stop()
-        pi.wave_clear()
-        pi.write(GPIO_TX, 0)
-        pi.stop()
-
-        print("✅ RF Jamming stopped smoothly. Receiver is safe now.")
-
-    except Exception as e:
-        pi.wave_tx_stop()
-        pi.wave_clear()
-        pi.write(GPIO_TX, 0)
-        pi.stop()
 
 if __name__ == "__main__":
-    rf_jamming()
\ No newline at end of file
+    import sys
+    from supervisor import run_cli
+    run_cli(Jammer(), ndjson="--ndjson" in sys.argv)
+    pigpio_pool.manager.close()
@@ -1,48 +1,85 @@
-import pigpio
 import time
-import sys
+import pigpio_pool
+import rf_notify
+from jamming_detector import (EdgeRing, JammingAnalyzer, NoiseBaseline, WINDOWS_MS, RATE_THRESHOLD,
+                              MIN_ENTROPY, BASELINE_PATH)
+from rf_messages import JammingLevel, Stopped
 
 GPIO_RX = 21
-pi = pigpio.pi()
+REPORT_INTERVAL = 0.25
+BASELINE_SAVE_INTERVAL = 60
 
-if not pi.connected:
-    exit("❌ Run sudo pigpiod first!")
 
-pi.set_mode(GPIO_RX, pigpio.INPUT)
-pi.set_pull_up_down(GPIO_RX, pigpio.PUD_DOWN)
+class JammingDetector:
+    """Watches receiver edges and reports jamming over sliding windows.
 
-pulse_count = 0
+    Edges land in an EdgeRing from the pigpio callback; every half short
+    window the analyzer catches up on them. A change of status is emitted
+    right away, otherwise a JammingLevel goes out every `report_interval`.
+    The site's noise baseline is loaded from `baseline_path` (None turns it
+    off) and saved back every BASELINE_SAVE_INTERVAL seconds and on stop.
+    With `notify` the ring is filled in blocks from the shared rf_notify
+    pipe, so a noise burst costs no Python call per edge."""
 
-def rf_callback(gpio, level, tick):
-    global pulse_count
-    pulse_count += 1
+    def __init__(self, gpio=GPIO_RX, windows_ms=WINDOWS_MS, rate_threshold=RATE_THRESHOLD,
+                 min_entropy=MIN_ENTROPY, report_interval=REPORT_INTERVAL, baseline_path=BASELINE_PATH,
+                 notify=False):
+        self.gpio = gpio
+        self.notify = notify
+        self.ring = EdgeRing()
+        self.step = min(windows_ms) / 2000
+        self.baseline_path = baseline_path
+        baseline = NoiseBaseline(self.step) if baseline_path else None
+        self.analyzer = JammingAnalyzer(windows_ms, rate_threshold, min_entropy, baseline)
+        self.report_interval = report_interval
 
-pi.callback(GPIO_RX, pigpio.EITHER_EDGE, rf_callback)
+    def save_baseline(self):
+        try:
+            self.analyzer.baseline.save(self.baseline_path)
+        except OSError as e:
+            print(f"⚠️ Error saving noise baseline: {e}")
 
-sys.stdout.flush()
+    def run(self, stop, emit):
+        analyzer = self.analyzer
+        baseline = analyzer.baseline
+        if baseline is not None and baseline.load(self.baseline_path):
+            print(f"📈 Noise baseline loaded: {baseline.mean:.0f} edges/s over {baseline.samples} samples")
+        pi = pigpio_pool.lease("jamming_detect")
+        try:
+            pi.set_mode(self.gpio, pigpio_pool.INPUT)
+            pi.set_pull_up_down(self.gpio, pigpio_pool.PUD_DOWN)
+            if self.notify:
+                rf_notify.subscribe(self.gpio, self.ring.extend)
+            else:
+                pi.callback(self.gpio, pigpio_pool.EITHER_EDGE, self.ring.rf_callback)
+            position = self.ring.written
+            last_report = last_save = time.monotonic()
+            while not stop.wait(self.step):
+                position, ticks, levels = self.ring.read(position)
+                analyzer.feed(ticks, levels)
+                was_jammed = analyzer.jammed
+                analyzer.update(pi.get_current_tick())
+                now = time.monotonic()
+                if analyzer.jammed != was_jammed or now - last_report >= self.report_interval:
+                    last_report = now
+                    emit(JammingLevel(analyzer.percent(), analyzer.status(),
+                                      len(analyzer.windows[-1].edges), analyzer.snapshot(),
+                                      round(analyzer.threshold()), round(baseline.z, 2) if baseline else None))
+                if baseline is not None and now - last_save >= BASELINE_SAVE_INTERVAL:
+                    last_save = now
+                    self.save_baseline()
+        finally:
+            if self.notify:
+                rf_notify.unsubscribe(self.gpio, self.ring.extend)
+            pi.release()
+            if baseline is not None:
+                self.save_baseline()
+            emit(Stopped("🛑 Detection stopped."))
 
-JAMMING_THRESHOLD = 2000  # تم زيادة الحد بوضوح
 
-try:
-    while True:
-        pulse_count = 0
-        time.sleep(1)
-
-        pulses_per_second = pulse_count
-
-        # تحديد حالة الجامينج الجديدة
-        if pulses_per_second < JAMMING_THRESHOLD:
-            jam_percentage = (pulses_per_second / JAMMING_THRESHOLD) * 100
-            status = "No Jamming"
-        else:
-            jam_percentage = 100
-            status = "High Jamming!"
-
-        output = f"J:{jam_percentage:.1f}% | S:{status}"
-        print(output)
-        sys.stdout.flush()  # ✅ ضروري لعرضها في شاشة TFT عبر subprocess في main.py
-
-except KeyboardInterrupt:
-    print("\n🛑 Detection stopped.")
-    sys.stdout.flush()
-    pi.stop()
+if __name__ == "__main__":
+    import sys
+    from supervisor import run_cli
+    # الاستخدام: python3 Jammingdetect.py [--ndjson] [--notify]
+    run_cli(JammingDetector(notify="--notify" in sys.argv), ndjson="--ndjson" in sys.argv)
+    pigpio_pool.manager.close()
@@ -0,0 +1,8 @@
+"""Decoder benchmarks. Run from Codes/: python3 -m benchmarks.decode_bench"""
+import os
+import sys
+
+# الموديولات في Codes/ مو package، فنضيف المجلد عشان `import rf_decoder` يشتغل
+CODES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if CODES_DIR not in sys.path:
+    sys.path.insert(0, CODES_DIR)
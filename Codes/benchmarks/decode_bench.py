@@ -0,0 +1,181 @@
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from . import CODES_DIR
+from .synth import FrameGenerator
+import rf_decoder
+from rf_decoder import PROFILES, FrameDecoder, timings_to_code
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+FRAMES = 2000
+ALLOC_FRAMES = 200
+CASES = (("pt2262", 24), ("ev1527", 24), ("ev1527", 32), ("ev1527", 64), ("ev1527", 128))
+SCENARIOS = {
+    "clean": dict(jitter_us=40),
+    "jitter": dict(jitter_us=120),
+    "noise": dict(jitter_us=40, noise_rate=0.3),
+    "overlap": dict(jitter_us=40, overlap_rate=0.3),
+}
+
+
+def bit_errors(frame, code):
+    # a missing or wrong-length decode costs every bit that does not line up
+    if code is None:
+        return frame.nbits
+    value, nbits = code
+    sent, got = frame.bits(), format(value, f"0{nbits}b")
+    return sum(a != b for a, b in zip(sent, got)) + abs(len(sent) - len(got))
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+def measure_allocations(decoder, frames):
+    """Mean peak bytes allocated per process_timings() call, and blocks
+    still held per frame afterwards (should stay at 0)."""
+    tracemalloc.start()
+    peak = 0
+    blocks = sys.getallocatedblocks()
+    for frame in frames:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        decoder.process_timings(frame.timings)
+        peak += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    held = sys.getallocatedblocks() - blocks
+    return peak / len(frames), max(held, 0) / len(frames)
+
+
+def run_case(protocol, nbits, scenario, frames=FRAMES, seed=0):
+    generator = FrameGenerator(seed=seed, **SCENARIOS[scenario])
+    batch = generator.frames(frames, nbits, protocol)
+    decoded = []
+    # كل frame بعد ثانية من اللي قبله حتى منع التكرار ما يرمي أي شي
+    clock = iter(range(1, 10 ** 9)).__next__
+    decoder = FrameDecoder(PROFILES.values(), lambda profile, value, nbits: decoded.append((value, nbits)),
+                           clock=clock)
+
+    errors = 0
+    for frame in batch:
+        errors += bit_errors(frame, timings_to_code(frame.timings))
+
+    latencies = []
+    correct = 0
+    elapsed = 0
+    for frame in batch:
+        t0 = time.perf_counter_ns()
+        decoder.process_timings(frame.timings)
+        t1 = time.perf_counter_ns()
+        latencies.append(t1 - t0)
+        elapsed += t1 - t0
+        if decoded and decoded[-1] == (frame.value, frame.nbits):
+            correct += 1
+        decoded.clear()
+    elapsed /= 1e9
+
+    alloc_bytes, alloc_blocks = measure_allocations(decoder, batch[:ALLOC_FRAMES])
+    latencies.sort()
+    return {
+        "protocol": protocol,
+        "bits": nbits,
+        "scenario": scenario,
+        "frames": frames,
+        "frames_per_sec": round(frames / elapsed),
+        "p50_us": round(percentile(latencies, 50) / 1000, 2),
+        "p99_us": round(percentile(latencies, 99) / 1000, 2),
+        "bit_error_rate": round(errors / (frames * nbits), 5),
+        "frames_ok": round(correct / frames, 4),
+        "alloc_bytes": round(alloc_bytes),
+        "alloc_blocks_held": round(alloc_blocks, 3),
+    }
+
+
+def run(frames=FRAMES, seed=0):
+    rows = []
+    for protocol, nbits in CASES:
+        for scenario in SCENARIOS:
+            rows.append(run_case(protocol, nbits, scenario, frames, seed))
+    return rows
+
+
+def git_label():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=CODES_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "local"
+
+
+def save_results(rows, label, backend):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{label}-{backend}.json")
+    data = {
+        "label": label,
+        "backend": backend,
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "rows": rows,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+    return path
+
+
+def previous_results(path, backend):
+    # آخر نتيجة محفوظة لنفس الـ backend غير الملف الحالي
+    others = [p for p in glob.glob(os.path.join(RESULTS_DIR, f"*-{backend}.json"))
+              if os.path.abspath(p) != os.path.abspath(path)]
+    if not others:
+        return None
+    with open(max(others, key=os.path.getmtime)) as f:
+        return json.load(f)
+
+
+def row_key(row):
+    return row["protocol"], row["bits"], row["scenario"]
+
+
+def print_table(rows, previous=None):
+    before = {row_key(row): row for row in previous["rows"]} if previous else {}
+    if previous:
+        print(f"📊 Compared with {previous['label']} ({previous['time']})")
+    print(f"{'case':24} {'frames/s':>10} {'p50 µs':>8} {'p99 µs':>8} {'BER':>8} {'ok':>7} {'bytes':>7}")
+    for row in rows:
+        case = f"{row['protocol']} {row['bits']} {row['scenario']}"
+        line = (f"{case:24} {row['frames_per_sec']:>10} {row['p50_us']:>8} {row['p99_us']:>8} "
+                f"{row['bit_error_rate']:>8} {row['frames_ok']:>7} {row['alloc_bytes']:>7}")
+        old = before.get(row_key(row))
+        if old:
+            speed = (row["frames_per_sec"] / old["frames_per_sec"] - 1) * 100
+            line += f"  {speed:+.0f}% speed"
+            if row["bit_error_rate"] > old["bit_error_rate"]:
+                line += f"  ⚠️ BER was {old['bit_error_rate']}"
+        print(line)
+
+
+if __name__ == "__main__":
+    # الاستخدام (من Codes/): python3 -m benchmarks.decode_bench [--frames N] [--label NAME] [--python]
+    args = sys.argv[1:]
+    frames = FRAMES
+    label = None
+    if "--frames" in args:
+        frames = int(args[args.index("--frames") + 1])
+    if "--label" in args:
+        label = args[args.index("--label") + 1]
+    if "--python" in args:
+        rf_decoder.BACKEND = "python"
+    backend = rf_decoder.BACKEND if rf_decoder.np is not None else "python"
+    print(f"⏱️ Decoding {frames} frames per case with the {backend} backend...")
+    rows = run(frames)
+    path = save_results(rows, label or git_label(), backend)
+    print_table(rows, previous_results(path, backend))
+    print(f"💾 Saved {path}")
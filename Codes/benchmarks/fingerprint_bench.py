@@ -0,0 +1,65 @@
+import random
+import sys
+import time
+
+from .synth import FrameGenerator
+import fingerprint
+from fingerprint import FingerprintIndex, extract_features
+
+DEVICES = 1000
+ENROLLED_FRAMES = 5
+CHECKS = 500
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+def make_devices(count, seed=0):
+    """Synthetic fobs: each has its own pulse length and high/low skew."""
+    rng = random.Random(seed)
+    devices = []
+    for i in range(count):
+        fob = FrameGenerator(seed=i, pulse_us=rng.randint(320, 380), jitter_us=15, skew_us=rng.randint(-40, 40))
+        devices.append((fob, fob.code(24)))
+    return devices
+
+
+def run(devices=DEVICES, checks=CHECKS):
+    fobs = make_devices(devices)
+    index = FingerprintIndex(max_per_key=ENROLLED_FRAMES)
+    for fob, value in fobs:
+        for _ in range(ENROLLED_FRAMES):
+            index.check(f"24:{value}", extract_features(fob.durations(value, 24)))
+    rows = []
+    # الـ clone زي rf_transmit: توقيت مضبوط على 350 µs بدون skew
+    cloner = FrameGenerator(seed=devices, jitter_us=5)
+    for name, source in (("genuine", None), ("clone", cloner)):
+        latencies = []
+        flagged = 0
+        for fob, value in fobs[:checks]:
+            features = extract_features((source or fob).durations(value, 24))
+            start = time.perf_counter()
+            match = index.check(f"24:{value}", features)
+            latencies.append(time.perf_counter() - start)
+            flagged += match.clone
+        latencies.sort()
+        rows.append({"frames": name, "fingerprints": len(index), "checks": len(latencies),
+                     "flagged": flagged, "p50_ms": percentile(latencies, 50) * 1000,
+                     "p99_ms": percentile(latencies, 99) * 1000})
+    return rows
+
+
+if __name__ == "__main__":
+    # الاستخدام (من Codes/): python3 -m benchmarks.fingerprint_bench [--devices N] [--python]
+    args = sys.argv[1:]
+    devices = DEVICES
+    if "--devices" in args:
+        devices = int(args[args.index("--devices") + 1])
+    if "--python" in args:
+        fingerprint.np = None
+    backend = "numpy" if fingerprint.np is not None else "python"
+    print(f"⏱️ Matching against {devices} enrolled transmitters with the {backend} backend...")
+    for row in run(devices, min(CHECKS, devices)):
+        print(f"{row['frames']:8} {row['fingerprints']:6} fingerprints  flagged {row['flagged']:4}/{row['checks']}"
+              f"  p50 {row['p50_ms']:.3f} ms  p99 {row['p99_ms']:.3f} ms")
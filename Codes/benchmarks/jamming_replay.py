@@ -0,0 +1,173 @@
+import random
+import sys
+
+from rf_sim import TICK_MASK, replay_decode, replay_jamming
+from rf_decoder import PROFILES
+from rf_transmit import PULSE_LENGTH, code_pulses
+from jamming_detector import NoiseBaseline
+from replay_detector import code_key
+from rolljam_detector import RollJamCorrelator
+
+STEP_MS = 25
+QUIET_RATE = 100
+WARM_S = 60
+CODE = 0x123456
+CODE_B = 0x654321
+
+
+class Timeline:
+    """Simulated GPIO edges built segment by segment: background noise,
+    a remote's presses, a jammer. `events` are (tick, level) like pigpio's."""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.level = 0
+        self.events = []
+
+    @property
+    def seconds(self):
+        return self.tick / 1e6
+
+    def widths(self, durations):
+        for duration in durations:
+            self.level ^= 1
+            self.events.append((self.tick & TICK_MASK, self.level))
+            self.tick += duration
+
+    def noise(self, seconds, rate=QUIET_RATE):
+        # edges عشوائية بمعدل rate في الثانية: ضجيج الموقع، أو تشويش wideband لو المعدل عالي
+        end = self.tick + seconds * 1e6
+        durations = []
+        total = self.tick
+        while total < end:
+            duration = int(self.rng.expovariate(rate / 1e6)) + 5
+            durations.append(duration)
+            total += duration
+        self.widths(durations)
+
+    def press(self, code=CODE, repeat=10, pulse_length=PULSE_LENGTH, jitter_us=0):
+        if self.level:
+            self.widths([50])
+        pulses = code_pulses(code, repeat=repeat, pulse_length=pulse_length)
+        self.widths([max(5, int(p.delay + self.rng.gauss(0, jitter_us))) for p in pulses])
+
+    def jam(self, seconds):
+        # زي Jamming.py: موجة مربعة عرضها عشوائي 50-500 µs يتغير كل 10 ms
+        end = self.tick + seconds * 1e6
+        while self.tick < end:
+            width = self.rng.randint(50, 500)
+            self.widths([width] * (2 * (10000 // (2 * width))))
+
+
+def jammed_samples(timeline, start=0.0, end=None):
+    baseline = NoiseBaseline(STEP_MS / 1000)
+    results = replay_jamming(timeline.events, STEP_MS, baseline=baseline)
+    return sum(1 for seconds, jammed, _ in results if jammed and start <= seconds and (end is None or seconds <= end))
+
+
+def correlate(timeline, **analyzer_args):
+    """Replay `timeline` through the analyzer and the decoder in simulated
+    time and feed both into a RollJamCorrelator, like RollJamDetector does.
+    Returns the alerts, each with the time after warm-up it was raised at."""
+    samples = replay_jamming(timeline.events, STEP_MS, baseline=NoiseBaseline(STEP_MS / 1000), **analyzer_args)
+    frames = replay_decode(timeline.events, [PROFILES["24"]]).frames
+    # (seconds, 0 = حالة التشويش قبل إطار بنفس الوقت, jammed أو key)
+    steps = []
+    was_jammed = False
+    for seconds, jammed, _ in samples:
+        if jammed != was_jammed:
+            steps.append((seconds, 0, jammed))
+            was_jammed = jammed
+    steps += [(seconds, 1, code_key(profile, value)) for value, nbits, profile, seconds in frames]
+    correlator = RollJamCorrelator()
+    alerts = []
+    for seconds, kind, item in sorted(steps):
+        if kind == 0:
+            correlator.on_jamming(item, seconds)
+            continue
+        alert = correlator.on_frame(item, seconds)
+        if alert is not None:
+            alerts.append((round(seconds - WARM_S, 1), alert["key"]))
+    return alerts
+
+
+def legit_press_on_quiet_site():
+    """A normal press after the baseline warmed up on a quiet site must not alarm."""
+    timeline = Timeline()
+    timeline.noise(WARM_S)
+    timeline.press()
+    timeline.noise(2)
+    jammed = jammed_samples(timeline, WARM_S)
+    return jammed == 0, f"{jammed} jammed samples"
+
+
+def fast_remote_on_quiet_site():
+    """A 150 µs remote goes over RATE_THRESHOLD; its low entropy keeps it from alarming."""
+    jammed = 0
+    for seed in range(5):
+        timeline = Timeline(seed)
+        timeline.noise(WARM_S)
+        timeline.press(pulse_length=150, jitter_us=20)
+        timeline.press(pulse_length=150, jitter_us=20)
+        timeline.noise(2)
+        jammed += jammed_samples(timeline, WARM_S)
+    return jammed == 0, f"{jammed} jammed samples over 5 presses"
+
+
+def jamming_on_quiet_site():
+    """Jamming.py's square wave, and wideband noise, must alarm for (nearly) all of the burst."""
+    counts = []
+    for jam in (Timeline.jam, lambda timeline, seconds: timeline.noise(seconds, 8000)):
+        timeline = Timeline()
+        timeline.noise(WARM_S)
+        jam(timeline, 2)
+        timeline.noise(2)
+        counts.append(jammed_samples(timeline, WARM_S, WARM_S + 2))
+    samples = 2000 // STEP_MS
+    return min(counts) >= samples * 0.9, f"{counts[0]} (square wave) and {counts[1]} (wideband) of {samples} samples jammed"
+
+
+def classic_rolljam():
+    """Jam 10-12 s captures A, jam 30-32 s captures B, A is replayed right after."""
+    timeline = Timeline()
+    timeline.noise(WARM_S + 10)
+    timeline.jam(2)
+    timeline.noise(0.05)
+    timeline.press(CODE)
+    timeline.noise(18)
+    timeline.jam(2)
+    timeline.noise(0.05)
+    timeline.press(CODE_B)
+    timeline.noise(0.05)
+    timeline.press(CODE)
+    timeline.noise(2)
+    alerts = correlate(timeline)
+    return [key for _, key in alerts] == [code_key("24", CODE)], f"alerts {alerts}"
+
+
+def fixed_fob_pressed_twice():
+    """A fixed-code fob pressed twice, 23 s apart, with the analyzer tuned so
+    tight that its own repeat train reads as a jam burst: no alert."""
+    timeline = Timeline()
+    timeline.noise(WARM_S + 10)
+    timeline.press(CODE)
+    timeline.noise(23)
+    timeline.press(CODE)
+    timeline.noise(2)
+    alerts = correlate(timeline, rate_threshold=800, min_entropy=0.0)
+    return not alerts, f"alerts {alerts}"
+
+
+SCENARIOS = (legit_press_on_quiet_site, fast_remote_on_quiet_site, jamming_on_quiet_site, classic_rolljam,
+             fixed_fob_pressed_twice)
+
+
+if __name__ == "__main__":
+    # الاستخدام (من Codes/): python3 -m benchmarks.jamming_replay
+    failed = 0
+    for scenario in SCENARIOS:
+        ok, detail = scenario()
+        failed += not ok
+        print(f"{'✅' if ok else '❌'} {scenario.__name__}: {detail}")
+    sys.exit(1 if failed else 0)
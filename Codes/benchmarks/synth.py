@@ -0,0 +1,124 @@
+import random
+from array import array
+
+from rf_decoder import MIN_EDGE_US, MAX_EDGE_US
+from rf_transmit import PULSE_LENGTH, SYNC, ZERO, ONE
+
+PROTOCOLS = ("pt2262", "ev1527")
+# PT2262 tri-state symbols as two bits each: 0 -> 00, 1 -> 11, F (floating) -> 01
+TRITS = (0b00, 0b11, 0b01)
+
+
+class SyntheticFrame:
+    """One generated transmission: the code that was sent and the timings
+    the receiver would hand to FrameDecoder for it."""
+
+    def __init__(self, value, nbits, protocol, timings, noisy=False, overlapped=False):
+        self.value = value
+        self.nbits = nbits
+        self.protocol = protocol
+        self.timings = timings
+        self.noisy = noisy
+        self.overlapped = overlapped
+
+    def bits(self):
+        return format(self.value, f"0{self.nbits}b")
+
+
+class FrameGenerator:
+    """Seeded generator of PT2262/EV1527-style 433 MHz frames.
+
+    Bits use the protocol-1 timings rf_transmit sends (1:3 for 0, 3:1 for 1,
+    `pulse_us` per unit) plus the sync high, with uniform `jitter_us` on
+    every duration; every high is `skew_us` longer and every low that much
+    shorter, like a transmitter's slow rise or fall. With probability
+    `noise_rate` a burst of short random pulses is spliced into the frame,
+    and with `overlap_rate` a second transmitter's frame is OR-ed over it at
+    a random offset. Timings are then filtered like EdgeCollector does, so
+    they match what the decoder sees."""
+
+    def __init__(self, seed=0, pulse_us=PULSE_LENGTH, jitter_us=40, noise_rate=0.0, overlap_rate=0.0, skew_us=0):
+        self.random = random.Random(seed)
+        self.pulse_us = pulse_us
+        self.jitter_us = jitter_us
+        self.skew_us = skew_us
+        self.noise_rate = noise_rate
+        self.overlap_rate = overlap_rate
+
+    def code(self, nbits, protocol="ev1527"):
+        rng = self.random
+        if protocol == "pt2262":
+            if nbits % 2:
+                raise ValueError("PT2262 frames carry whole tri-state symbols (even bit counts)")
+            value = 0
+            for _ in range(nbits // 2):
+                value = (value << 2) | rng.choice(TRITS)
+            return value
+        if protocol == "ev1527":
+            # EV1527: 20-bit chip ID then 4 key bits; longer frames just have a longer ID
+            return rng.getrandbits(nbits)
+        raise ValueError(f"Unknown protocol {protocol} (use {', '.join(PROTOCOLS)})")
+
+    def durations(self, value, nbits):
+        """Alternating high/low durations (µs) of one frame, ending on the sync high."""
+        rng = self.random
+        jitter = self.jitter_us
+        skew = self.skew_us
+        out = []
+        for i in range(nbits - 1, -1, -1):
+            high, low = ONE if (value >> i) & 1 else ZERO
+            out.append(high * self.pulse_us + skew + rng.randint(-jitter, jitter))
+            out.append(low * self.pulse_us - skew + rng.randint(-jitter, jitter))
+        out.append(SYNC[0] * self.pulse_us + skew + rng.randint(-jitter, jitter))
+        return out
+
+    def noise_burst(self, durations):
+        rng = self.random
+        at = rng.randrange(len(durations))
+        burst = [rng.randint(MIN_EDGE_US // 2, 2 * self.pulse_us) for _ in range(rng.randint(2, 8))]
+        return durations[:at] + burst + durations[at:]
+
+    def frame(self, nbits, protocol="ev1527"):
+        rng = self.random
+        value = self.code(nbits, protocol)
+        durations = self.durations(value, nbits)
+        noisy = rng.random() < self.noise_rate
+        if noisy:
+            durations = self.noise_burst(durations)
+        overlapped = rng.random() < self.overlap_rate
+        if overlapped:
+            other = self.durations(self.code(nbits, protocol), nbits)
+            durations = overlay(durations, other, rng.randrange(sum(durations)))
+        timings = array("H", [d for d in durations if MIN_EDGE_US < d < MAX_EDGE_US])
+        return SyntheticFrame(value, nbits, protocol, memoryview(timings), noisy, overlapped)
+
+    def frames(self, count, nbits, protocol="ev1527"):
+        return [self.frame(nbits, protocol) for _ in range(count)]
+
+
+def high_spans(durations, offset=0):
+    spans = []
+    t = offset
+    for i, duration in enumerate(durations):
+        if i % 2 == 0:
+            spans.append((t, t + duration))
+        t += duration
+    return spans
+
+
+def overlay(a, b, offset):
+    """The signal a receiver sees when `b` starts `offset` µs into `a`:
+    high whenever either transmitter is high. Returns high-first durations."""
+    spans = sorted(high_spans(a) + high_spans(b, offset))
+    merged = [list(spans[0])]
+    for start, end in spans[1:]:
+        if start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    out = []
+    for i, (start, end) in enumerate(merged):
+        if i:
+            out.append(start - merged[i - 1][1])
+        out.append(end - start)
+    return out
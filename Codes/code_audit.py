@@ -0,0 +1,157 @@
+import math
+
+ANALYZING = "analyzing"
+FIXED = "fixed"
+ROLLING = "rolling"
+PARTLY_STATIC = "partly static"
+
+# أقل عدد ضغطات قبل ما نحكم
+MIN_PRESSES = 3
+# الريموت يكرر الإطار كل ~50-200 ms وهو مضغوط؛ سكوت أطول من كذا = الزر انترك
+PRESS_GAP_S = 0.3
+# ضغطة أطول من كذا غالباً ضغطتين ما انترك الزر بينهم
+HOLD_S = 1.5
+# نصف الضغطات أو أكثر ترجع لكود سابق (أو زر ثاني من نفس الريموت) = fixed
+REPEAT_MIN = 0.5
+# كم bit ثابت زيادة عن اللي يثبت بالصدفة في كود عشوائي حتى نقول partly static
+STATIC_MARGIN = 0.25
+MAX_CLUSTERS = 64
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def bit_entropy(ones, total):
+    # entropy الـ bit position بالـ bits: 0 = ثابت، 1 = عشوائي تماماً
+    p = ones / total
+    if p in (0, 1):
+        return 0.0
+    return -p * math.log2(p) - (1 - p) * math.log2(1 - p)
+
+
+class CodeAudit:
+    """Incremental fixed / rolling verdict for the presses of one fob.
+
+    Frames come in through observe(); repeats of the same code with less
+    than `gap_s` between consecutive frames are one press, however long it
+    is held. A press longer than `hold_s` sets `held`, as the user most
+    likely did not let go of the button between presses. Each press's code
+    (a packed int) is put in the first cluster within `nbits // 8` bits of
+    Hamming distance, so the other buttons of a fixed-code fob land in the
+    same cluster, or starts a new one. Per bit position the number of
+    presses with that bit set is kept, which gives the bit-position entropy
+    and the count of static bits.
+
+    After `min_presses` presses the verdict is FIXED when at least
+    REPEAT_MIN of the presses fell into an earlier cluster; otherwise it is
+    PARTLY_STATIC when the share of static bits is STATIC_MARGIN above what
+    random codes would leave static by chance (2 ** (1 - presses)), e.g. a
+    KeeLoq hop code with its serial in clear, and ROLLING when it is not.
+    Every press costs O(nbits + clusters); frames of another length than the
+    first one are counted in `ignored`."""
+
+    def __init__(self, gap_s=PRESS_GAP_S, hold_s=HOLD_S, min_presses=MIN_PRESSES):
+        self.gap_s = gap_s
+        self.hold_s = hold_s
+        self.min_presses = min_presses
+        self.nbits = None
+        self.presses = 0
+        self.repeats = 0
+        self.ignored = 0
+        self.clusters = []
+        self.ones = []
+        self.hamming_sum = 0
+        self.last_value = None
+        self.last_time = None
+        self.press_start = None
+        self.held = False
+        self.verdict = ANALYZING
+
+    def observe(self, value, nbits, now):
+        """Feed one decoded frame; returns True when summary() changed: a new
+        press, or the current one has been held past `hold_s`."""
+        if self.nbits is None:
+            self.nbits = nbits
+            self.ones = [0] * nbits
+        elif nbits != self.nbits:
+            self.ignored += 1
+            return False
+        if value == self.last_value and now - self.last_time <= self.gap_s:
+            self.last_time = now
+            if not self.held and now - self.press_start > self.hold_s:
+                self.held = True
+                return True
+            return False
+        if self.last_value is not None:
+            self.hamming_sum += hamming(value, self.last_value)
+        self.last_value = value
+        self.last_time = self.press_start = now
+        self.held = False
+        self.presses += 1
+        for i in range(nbits):
+            if (value >> i) & 1:
+                self.ones[i] += 1
+        self.cluster(value)
+        self.verdict = self.classify()
+        return True
+
+    def cluster(self, value):
+        limit = max(1, self.nbits // 8)
+        for center in self.clusters:
+            if hamming(value, center) <= limit:
+                self.repeats += 1
+                return
+        if len(self.clusters) < MAX_CLUSTERS:
+            self.clusters.append(value)
+
+    def static_bits(self):
+        return sum(1 for ones in self.ones if ones in (0, self.presses))
+
+    def entropy(self):
+        """Mean bit-position entropy over all positions, 0..1."""
+        if not self.presses:
+            return 0.0
+        return sum(bit_entropy(ones, self.presses) for ones in self.ones) / self.nbits
+
+    def classify(self):
+        if self.presses < self.min_presses:
+            return ANALYZING
+        if self.repeats / (self.presses - 1) >= REPEAT_MIN:
+            return FIXED
+        chance = 2 ** (1 - self.presses)
+        if self.static_bits() / self.nbits - chance >= STATIC_MARGIN:
+            return PARTLY_STATIC
+        return ROLLING
+
+    def summary(self):
+        """The fields of an rf_messages.AuditResult."""
+        return {
+            "nbits": self.nbits,
+            "presses": self.presses,
+            "verdict": self.verdict,
+            "clusters": len(self.clusters),
+            "static_bits": self.static_bits(),
+            "entropy": round(self.entropy(), 2),
+            "hamming": round(self.hamming_sum / (self.presses - 1), 1) if self.presses > 1 else 0.0,
+            "held": self.held,
+        }
+
+
+if __name__ == "__main__":
+    import sys
+    import pigpio_pool
+    from recever import Receiver
+    from rf_decoder import PROFILES
+    from rf_protocols import PROTOCOLS
+    from supervisor import run_cli
+
+    # الاستخدام: python3 code_audit.py [--ndjson] [--notify] [24|32|64|128|ev1527|pt2262|keeloq]
+    # اضغط زر الريموت كم مرة؛ الحكم يطلع بعد MIN_PRESSES ضغطات
+    args = sys.argv[1:]
+    names = [arg for arg in args if not arg.startswith("--")] or ["24"]
+    unknown = [name for name in names if name not in PROFILES and name not in PROTOCOLS]
+    if unknown:
+        exit(f"❌ Unknown bit length or protocol: {', '.join(unknown)} (use {', '.join([*PROFILES, *PROTOCOLS])})")
+    run_cli(Receiver(names, notify="--notify" in args, audit=CodeAudit()), ndjson="--ndjson" in args)
+    pigpio_pool.manager.close()
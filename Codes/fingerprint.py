@@ -0,0 +1,275 @@
+import threading
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FEATURES = ("short_high", "long_high", "short_low", "long_low", "high_ratio", "low_ratio",
+            "duty", "period", "high_jitter", "low_jitter")
+# كل feature تنقسم على الفرق اللي نتوقعه بين ضغطات نفس الريموت، فالمسافة تصير بوحدة "كم مرة أبعد من العادي"
+FEATURE_SCALES = (10.0, 10.0, 10.0, 10.0, 0.05, 0.05, 0.02, 15.0, 8.0, 8.0)
+K_NEIGHBOURS = 3
+# أول ENROLL_FRAMES إطارات لكل كود تتسجل بدون فحص (trust on first use)
+ENROLL_FRAMES = 3
+MAX_PER_KEY = 20
+MATCH_DISTANCE = 4.0
+
+
+def _mean(values):
+    return sum(values) / len(values)
+
+
+def _spread(*groups):
+    # stddev مجمّع: كل مجموعة حول متوسطها هي
+    total = sum((x - m) ** 2 for group in groups for m in (_mean(group),) for x in group)
+    return (total / sum(len(group) for group in groups)) ** 0.5
+
+
+def _features_py(timings):
+    data = list(timings)
+    mean = _mean(data)
+    stddev = (sum((x - mean) ** 2 for x in data) / len(data)) ** 0.5
+    data = [x for x in data if mean - 2 * stddev <= x <= mean + 2 * stddev]
+    highs, lows = data[::2], data[1::2]
+    if len(highs) < 2 or len(lows) < 2:
+        return None
+    avg_high, avg_low = _mean(highs), _mean(lows)
+    zeros = [(h, l) for h, l in zip(highs, lows) if h < avg_high and l > avg_low]
+    ones = [(h, l) for h, l in zip(highs, lows) if h > avg_high and l < avg_low]
+    if len(zeros) < 2 or len(ones) < 2:
+        return None
+    short_high, long_low = [h for h, _ in zeros], [l for _, l in zeros]
+    long_high, short_low = [h for h, _ in ones], [l for _, l in ones]
+    pairs = zeros + ones
+    return (_mean(short_high), _mean(long_high), _mean(short_low), _mean(long_low),
+            _mean(long_high) / _mean(short_high), _mean(long_low) / _mean(short_low),
+            _mean([h for h, _ in pairs]) / _mean([l for _, l in pairs]), _mean([h + l for h, l in pairs]),
+            _spread(short_high, long_high), _spread(short_low, long_low))
+
+
+def _features_np(timings):
+    data = np.array(timings, dtype=np.float64)
+    mean, stddev = data.mean(), data.std()
+    data = data[(data >= mean - 2 * stddev) & (data <= mean + 2 * stddev)]
+    highs, lows = data[::2], data[1::2]
+    if highs.size < 2 or lows.size < 2:
+        return None
+    avg_high, avg_low = highs.mean(), lows.mean()
+    highs = highs[:lows.size]
+    zeros = (highs < avg_high) & (lows > avg_low)
+    ones = (highs > avg_high) & (lows < avg_low)
+    if zeros.sum() < 2 or ones.sum() < 2:
+        return None
+    short_high, long_low = highs[zeros], lows[zeros]
+    long_high, short_low = highs[ones], lows[ones]
+    pairs = zeros | ones
+    high_dev = np.concatenate((short_high - short_high.mean(), long_high - long_high.mean()))
+    low_dev = np.concatenate((short_low - short_low.mean(), long_low - long_low.mean()))
+    return (short_high.mean(), long_high.mean(), short_low.mean(), long_low.mean(),
+            long_high.mean() / short_high.mean(), long_low.mean() / short_low.mean(),
+            highs[pairs].mean() / lows[pairs].mean(), (highs[pairs] + lows[pairs]).mean(),
+            np.sqrt((high_dev ** 2).mean()), np.sqrt((low_dev ** 2).mean()))
+
+
+def extract_features(timings):
+    """Timing fingerprint of one frame as a tuple in FEATURES order, or None.
+
+    `timings` are the frame's high-first durations (a list or an EdgeBuffer
+    memoryview). After the same 2-sigma outlier filter as timings_to_code,
+    bit pairs are split around the average high/low into zeros (short high,
+    long low) and ones (long high, short low); the vector holds the mean of
+    each width, the long/short ratios, avg_high/avg_low, the bit period and
+    the spread of highs and lows around their class means (jitter). Frames
+    without at least two bits of each kind return None."""
+    if len(timings) < 4:
+        return None
+    if np is not None:
+        features = _features_np(timings)
+    else:
+        features = _features_py(timings)
+    return None if features is None else tuple(float(x) for x in features)
+
+
+class FingerprintMatch:
+    """Result of FingerprintIndex.check() for an enrolled code.
+
+    `distance` is the mean distance to the code's own `k` nearest enrolled
+    fingerprints (in FEATURE_SCALES units); `nearest` is the key of the
+    closest fingerprint overall, which names the transmitter the frame most
+    looks like. `clone` is set when `distance` is over the match limit."""
+
+    def __init__(self, key, distance, nearest, nearest_distance, clone):
+        self.key = key
+        self.distance = distance
+        self.nearest = nearest
+        self.nearest_distance = nearest_distance
+        self.clone = clone
+
+
+class FingerprintIndex:
+    """Enrolled timing fingerprints of every transmitter, for clone detection.
+
+    Fingerprints live in one preallocated float32 matrix (scaled by
+    FEATURE_SCALES, grown by doubling) with an int label per row, so a
+    lookup is a single vectorized distance pass over all of them; thousands
+    of rows take well under a millisecond. The first `enroll_frames` frames
+    of a code are enrolled as they come (trust on first use); after that
+    check() matches each frame against them, and frames that match are
+    enrolled too, up to `max_per_key`, so slow drift (battery, temperature)
+    is followed. With a `store` (key_store.KeyStore) fingerprints are saved
+    next to the keys in keys.db and load() brings them back. A key deleted
+    from the store (by any process) is forgotten before it can raise a
+    clone: the store is asked before every clone verdict."""
+
+    def __init__(self, store=None, k=K_NEIGHBOURS, enroll_frames=ENROLL_FRAMES, max_per_key=MAX_PER_KEY,
+                 max_distance=MATCH_DISTANCE):
+        self.store = store
+        self.k = k
+        self.enroll_frames = enroll_frames
+        self.max_per_key = max_per_key
+        self.max_distance = max_distance
+        self.keys = []
+        self.label_of = {}
+        self.counts = Counter()
+        self.size = 0
+        self.alerts = 0
+        if np is not None:
+            self.scales = np.array(FEATURE_SCALES, dtype=np.float32)
+            self.features = np.empty((256, len(FEATURES)), dtype=np.float32)
+            self.labels = np.empty(256, dtype=np.int32)
+        else:
+            self.features = []
+            self.labels = []
+        # الـ pipeline thread و الـ callback thread (rf_protocols) ممكن يستدعوا check مع بعض
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.size
+
+    def load(self):
+        """Load the fingerprints saved in `store`; returns how many came back."""
+        if self.store is None:
+            return 0
+        for key, features in self.store.fingerprints():
+            self._add(key, features)
+        return self.size
+
+    def _add(self, key, features):
+        label = self.label_of.get(key)
+        if label is None:
+            label = self.label_of[key] = len(self.keys)
+            self.keys.append(key)
+        if np is not None:
+            if self.size == len(self.labels):
+                self.features = np.concatenate((self.features, np.empty_like(self.features)))
+                self.labels = np.concatenate((self.labels, np.empty_like(self.labels)))
+            self.features[self.size] = np.asarray(features, dtype=np.float32) / self.scales
+            self.labels[self.size] = label
+        else:
+            self.features.append([x / s for x, s in zip(features, FEATURE_SCALES)])
+            self.labels.append(label)
+        self.size += 1
+        self.counts[key] += 1
+
+    def forget(self, key):
+        """Drop every fingerprint of `key`; returns how many were removed."""
+        with self._lock:
+            return self._forget(key)
+
+    def _forget(self, key):
+        label = self.label_of.get(key)
+        if label is None or not self.counts[key]:
+            return 0
+        if np is not None:
+            keep = self.labels[:self.size] != label
+            size = int(keep.sum())
+            self.features[:size] = self.features[:self.size][keep]
+            self.labels[:size] = self.labels[:self.size][keep]
+        else:
+            rows = [(row, l) for row, l in zip(self.features, self.labels) if l != label]
+            self.features = [row for row, _ in rows]
+            self.labels = [l for _, l in rows]
+            size = len(rows)
+        removed = self.size - size
+        self.size = size
+        del self.counts[key]
+        return removed
+
+    def enroll(self, key, features):
+        self._add(key, features)
+        if self.store is not None:
+            self.store.add_fingerprint(key, features)
+
+    def distances(self, features):
+        """Distance from `features` to every enrolled fingerprint, in row order."""
+        if np is not None:
+            diff = self.features[:self.size] - np.asarray(features, dtype=np.float32) / self.scales
+            return np.sqrt(np.einsum("ij,ij->i", diff, diff))
+        query = [x / s for x, s in zip(features, FEATURE_SCALES)]
+        return [sum((a - b) ** 2 for a, b in zip(row, query)) ** 0.5 for row in self.features]
+
+    def nearest(self, features, k=None):
+        """The `k` nearest fingerprints as [(distance, key)], closest first."""
+        k = min(k or self.k, self.size)
+        if not k:
+            return []
+        distances = self.distances(features)
+        if np is not None:
+            rows = np.argpartition(distances, k - 1)[:k]
+            rows = rows[np.argsort(distances[rows])]
+            return [(float(distances[i]), self.keys[self.labels[i]]) for i in rows]
+        rows = sorted(range(self.size), key=distances.__getitem__)[:k]
+        return [(distances[i], self.keys[self.labels[i]]) for i in rows]
+
+    def check(self, key, features):
+        """Enroll or match one frame of `key`; returns a FingerprintMatch once enrolled."""
+        with self._lock:
+            if self.counts[key] < self.enroll_frames:
+                self.enroll(key, features)
+                return None
+            label = self.label_of[key]
+            distances = self.distances(features)
+            if np is not None:
+                own = distances[self.labels[:self.size] == label]
+                own = own[np.argpartition(own, min(self.k, own.size) - 1)[:self.k]]
+                distance = float(own.mean())
+                row = int(distances.argmin())
+            else:
+                own = sorted(d for d, l in zip(distances, self.labels) if l == label)[:self.k]
+                distance = sum(own) / len(own)
+                row = min(range(self.size), key=distances.__getitem__)
+            clone = distance > self.max_distance
+            if clone and self.store is not None and not self.store.has_fingerprints(key):
+                # المفتاح انحذف من keys.db: نبدأ تسجيله من جديد بدل إنذار
+                self._forget(key)
+                self.enroll(key, features)
+                return None
+            if clone:
+                self.alerts += 1
+            elif self.counts[key] < self.max_per_key:
+                self.enroll(key, features)
+            return FingerprintMatch(key, distance, self.keys[self.labels[row]], float(distances[row]), clone)
+
+
+if __name__ == "__main__":
+    import sys
+    import pigpio_pool
+    from key_store import KeyStore
+    from recever import Receiver
+    from rf_decoder import PROFILES
+    from rf_protocols import PROTOCOLS
+    from supervisor import run_cli
+
+    # الاستخدام: python3 fingerprint.py [--ndjson] [--notify] [24 32 64 128 ev1527 pt2262 keeloq]
+    args = sys.argv[1:]
+    names = [arg for arg in args if not arg.startswith("--")] or [*PROFILES, "keeloq"]
+    unknown = [name for name in names if name not in PROFILES and name not in PROTOCOLS]
+    if unknown:
+        exit(f"❌ Unknown bit length or protocol: {', '.join(unknown)} (use {', '.join([*PROFILES, *PROTOCOLS])})")
+    store = KeyStore()
+    index = FingerprintIndex(store)
+    print(f"🧬 Fingerprints: {index.load()} enrolled for {len(index.keys)} codes")
+    run_cli(Receiver(names, store, notify="--notify" in args, fingerprints=index), ndjson="--ndjson" in args)
+    pigpio_pool.manager.close()
@@ -0,0 +1,297 @@
+import json
+import math
+import os
+from array import array
+from collections import deque
+
+TICK_MASK = 0xFFFFFFFF
+WINDOWS_MS = (50, 250, 1000)
+# edges/s; نفس حد الـ 2000 نبضة في الثانية القديم
+RATE_THRESHOLD = 2000
+# entropy الـ 50 ms لازم توصل كذا عشان يبدأ إنذار تحت OOK_MAX_RATE. متقاس بـ rf_sim
+# (benchmarks/jamming_replay.py): ريموت OOK سريع (pulse 100-200 µs، jitter لين 20 µs) 0.18-0.38،
+# ضجيج wideband 0.43 وفوق. موجة Jamming.py المربعة 0.16-0.39 وتعدي بـ OOK_MAX_RATE وبإنذار مستمر
+MIN_ENTROPY = 0.4
+# edges/s؛ أسرع ريموت OOK (pulse 100 µs) يوصل ~4000، فوق كذا ما يحتاج الإنذار entropy
+OOK_MAX_RATE = 4500
+BUCKET_US = 50
+BUCKETS = 64
+RING_SIZE = 1 << 15
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BASE_DIR, "noise_baseline.json")
+# الـ baseline ينسى نص اللي تعلّمه كل 10 دقائق
+BASELINE_HALF_LIFE = 600
+BASELINE_WARMUP = 30
+# أثناء الإنذار المتوسط يتعلم ببطء: تشويش دقايق ما يأثر، بس ضجيج جديد ثابت يصير الطبيعي خلال ساعات
+ALARM_HALF_LIFE = 3600
+Z_ALERT = 6.0
+CUSUM_K = 0.5
+CUSUM_H = 10.0
+# edges/s؛ حتى لو الموقع هادي تماماً ما نعتبر كم edge عشوائية تشويش
+MIN_STD = 200.0
+
+
+class EdgeRing:
+    """Preallocated ring of (tick, level) filled by the pigpio callback.
+
+    There is one writer (the callback) and one reader (the analyzer). The
+    writer only ever increments `written`; the reader remembers how far it
+    got, so nothing is reset and no lock is shared with the callback. If the
+    reader falls more than `size` edges behind, the oldest ones are counted
+    in `lost` and skipped."""
+
+    def __init__(self, size=RING_SIZE):
+        if size & (size - 1):
+            raise ValueError("Ring size must be a power of two")
+        self.size = size
+        self.mask = size - 1
+        self.ticks = array("L", [0]) * size
+        self.levels = bytearray(size)
+        self.written = 0
+        self.lost = 0
+
+    def rf_callback(self, gpio, level, tick):
+        if level > 1:  # watchdog TIMEOUT، مو edge
+            return
+        i = self.written & self.mask
+        self.ticks[i] = tick
+        self.levels[i] = level
+        self.written += 1
+
+    def extend(self, ticks, levels):
+        """Bulk rf_callback for a block from rf_notify; TIMEOUTs are skipped."""
+        if hasattr(ticks, "tolist"):
+            ticks, levels = ticks.tolist(), levels.tolist()
+        edges = [(tick, level) for tick, level in zip(ticks, levels) if level <= 1]
+        # كتلة أكبر من الـ ring: آخر size edge بس هي اللي تبقى
+        skipped = max(len(edges) - self.size, 0)
+        edges = edges[skipped:]
+        written = self.written + skipped
+        done = 0
+        while done < len(edges):
+            i = (written + done) & self.mask
+            part = edges[done:done + self.size - i]
+            self.ticks[i:i + len(part)] = array("L", [tick for tick, level in part])
+            self.levels[i:i + len(part)] = bytes(level for tick, level in part)
+            done += len(part)
+        self.written = written + done
+
+    def read(self, start):
+        """Return (next_start, ticks, levels) for every edge since `start`."""
+        end = self.written
+        if end - start > self.size:
+            self.lost += end - self.size - start
+            start = end - self.size
+        a, b = start & self.mask, end & self.mask
+        if start == end:
+            return end, (), b""
+        if a < b:
+            ticks, levels = self.ticks[a:b], self.levels[a:b]
+        else:
+            ticks, levels = self.ticks[a:] + self.ticks[:b], self.levels[a:] + self.levels[:b]
+        # الكاتب ممكن يلف علينا أثناء النسخ؛ اللي انكتب فوقه نرميه
+        overwritten = self.written - self.size - start
+        if overwritten > 0:
+            self.lost += overwritten
+            ticks, levels = ticks[overwritten:], levels[overwritten:]
+        return end, ticks, levels
+
+
+class EdgeWindow:
+    """Edge rate, duty cycle and inter-edge entropy over the last `ms`.
+
+    Edges are added and expired one at a time with running sums, so an
+    update costs O(new + expired edges), not O(window)."""
+
+    def __init__(self, ms, bucket_us=BUCKET_US, buckets=BUCKETS):
+        self.ms = ms
+        self.span = ms * 1000
+        self.bucket_us = bucket_us
+        self.buckets = buckets
+        self.edges = deque()
+        self.total = 0
+        self.high = 0
+        self.histogram = [0] * (buckets + 1)
+
+    def add(self, tick, dt, was_high):
+        dt = min(dt, self.span)
+        bucket = min(dt // self.bucket_us, self.buckets)
+        self.edges.append((tick, dt, was_high, bucket))
+        self.total += dt
+        if was_high:
+            self.high += dt
+        self.histogram[bucket] += 1
+
+    def expire(self, now):
+        edges = self.edges
+        while edges and (now - edges[0][0]) & TICK_MASK > self.span:
+            tick, dt, was_high, bucket = edges.popleft()
+            self.total -= dt
+            if was_high:
+                self.high -= dt
+            self.histogram[bucket] -= 1
+
+    def rate(self):
+        return len(self.edges) * 1000000 / self.span
+
+    def duty(self):
+        return self.high / self.total if self.total else 0.0
+
+    def entropy(self):
+        # Shannon entropy of the interval histogram, 0 (one interval) .. 1 (uniform)
+        n = len(self.edges)
+        if n < 2:
+            return 0.0
+        h = sum(c / n * math.log2(n / c) for c in self.histogram if c)
+        return h / math.log2(self.buckets + 1)
+
+
+class NoiseBaseline:
+    """Learned normal edge rate for this site, with a change-point test.
+
+    Each `update(rate)` is O(1): an EWMA of the mean and variance of the
+    short-window rate, then a z-score against it and a one-sided CUSUM of
+    the z-scores. `update()` returns None until `warmup` seconds of samples
+    have been seen, then whether the sample is anomalous. Anomalous samples
+    only move the mean, with the much longer `alarm_half_life`, so a burst
+    of minutes barely moves the baseline, but a noise floor that rises and
+    stays up (a new appliance, a move) becomes the new normal within hours
+    and the alarm clears. The state is a handful of floats and is saved to
+    JSON so a restart is warm straight away."""
+
+    def __init__(self, sample_interval, half_life=BASELINE_HALF_LIFE, warmup=BASELINE_WARMUP,
+                 z_alert=Z_ALERT, cusum_k=CUSUM_K, cusum_h=CUSUM_H, min_std=MIN_STD,
+                 alarm_half_life=ALARM_HALF_LIFE):
+        self.alpha = 1 - 0.5 ** (sample_interval / half_life)
+        self.alarm_alpha = 1 - 0.5 ** (sample_interval / alarm_half_life)
+        self.warmup_samples = int(warmup / sample_interval)
+        self.z_alert = z_alert
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.min_std = min_std
+        self.mean = 0.0
+        self.var = 0.0
+        self.samples = 0
+        self.cusum = 0.0
+        self.z = 0.0
+
+    @property
+    def warm(self):
+        return self.samples >= self.warmup_samples
+
+    def std(self):
+        return max(math.sqrt(self.var), self.min_std)
+
+    def threshold(self):
+        return self.mean + self.z_alert * self.std()
+
+    def update(self, rate):
+        if not self.warm:
+            self.learn(rate)
+            return None
+        self.z = (rate - self.mean) / self.std()
+        # الـ cap يخلي الإنذار يطفي بسرعة بعد ما يوقف التشويش
+        self.cusum = min(max(0.0, self.cusum + self.z - self.cusum_k), 1.5 * self.cusum_h)
+        alarm = self.z >= self.z_alert or self.cusum >= self.cusum_h
+        if alarm:
+            # بس المتوسط: الـ variance لو تعلّم من التشويش يرفع الـ threshold بعده
+            self.mean += self.alarm_alpha * (rate - self.mean)
+        else:
+            self.learn(rate)
+        return alarm
+
+    def learn(self, rate):
+        # أثناء الـ warm-up متوسط تراكمي عادي، بعدها EWMA
+        alpha = max(self.alpha, 1 / (self.samples + 1))
+        diff = rate - self.mean
+        self.mean += alpha * diff
+        self.var = (1 - alpha) * (self.var + alpha * diff * diff)
+        self.samples += 1
+
+    def to_dict(self):
+        return {"mean": self.mean, "var": self.var, "samples": self.samples}
+
+    def save(self, path=BASELINE_PATH):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    def load(self, path=BASELINE_PATH):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            self.mean = float(data["mean"])
+            self.var = float(data["var"])
+            self.samples = int(data["samples"])
+            return True
+        except FileNotFoundError:
+            return False
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Ignoring unreadable noise baseline {path}: {e}")
+            return False
+
+
+class JammingAnalyzer:
+    """Sliding-window jamming decision on pigpio edge ticks.
+
+    `feed()` takes edges from an EdgeRing and `update(now)` expires old ones
+    against the current tick. The shortest window decides `jammed`, so an
+    alert fires as soon as that window turns anomalous; the longest one gives
+    the steadier percentage shown on screen. The short window has to reach
+    `rate_threshold`; with a warm `baseline` it also has to be anomalous for
+    the baseline's z-score/CUSUM, so a noisy site raises the bar but a quiet
+    one never lowers it below what a remote's own frames reach. Below
+    `ook_max_rate` an alarm only starts if the window's interval entropy is
+    at least `min_entropy` (a remote's frames use two or three widths); once
+    started it holds for as long as the rate does."""
+
+    def __init__(self, windows_ms=WINDOWS_MS, rate_threshold=RATE_THRESHOLD, min_entropy=MIN_ENTROPY,
+                 baseline=None, ook_max_rate=OOK_MAX_RATE):
+        self.windows = [EdgeWindow(ms) for ms in sorted(windows_ms)]
+        self.rate_threshold = rate_threshold
+        self.min_entropy = min_entropy
+        self.ook_max_rate = ook_max_rate
+        self.baseline = baseline
+        self.last_tick = None
+        self.jammed = False
+
+    def feed(self, ticks, levels):
+        windows = self.windows
+        last_tick = self.last_tick
+        for tick, level in zip(ticks, levels):
+            if last_tick is not None:
+                dt = (tick - last_tick) & TICK_MASK
+                # level هو المستوى بعد الحافة، فقبلها كانت الإشارة عكسه
+                was_high = level == 0
+                for window in windows:
+                    window.add(tick, dt, was_high)
+            last_tick = tick
+        self.last_tick = last_tick
+
+    def update(self, now):
+        for window in self.windows:
+            window.expire(now)
+        short = self.windows[0]
+        rate = short.rate()
+        alarm = self.baseline.update(rate) if self.baseline is not None else None
+        # None = الـ baseline لسه بارد؛ الحد الثابت أرضية دايماً: ضغطة ريموت في موقع هادي مو تشويش
+        alarm = alarm is not False and rate >= self.rate_threshold
+        # الـ entropy تحكم بداية الإنذار بس؛ بعدها يكفي المعدل عشان موجة الـ jammer ما تخلي الحالة ترمش
+        self.jammed = alarm and (self.jammed or rate >= self.ook_max_rate or short.entropy() >= self.min_entropy)
+        return self.jammed
+
+    def threshold(self):
+        if self.baseline is not None and self.baseline.warm:
+            return max(self.rate_threshold, self.baseline.threshold())
+        return self.rate_threshold
+
+    def percent(self):
+        return min(100.0, self.windows[-1].rate() / self.threshold() * 100)
+
+    def status(self):
+        return "High Jamming!" if self.jammed else "No Jamming"
+
+    def snapshot(self):
+        return [[w.ms, round(w.rate()), round(w.duty(), 3), round(w.entropy(), 3)] for w in self.windows]
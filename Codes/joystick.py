@@ -0,0 +1,126 @@
+import queue
+import threading
+import time
+import RPi.GPIO as GPIO
+from screens import UP, DOWN, PRESS
+
+ADS1115_ADDRESS = 0x48
+BUTTON_PIN = 16
+# AIN1 = VRy; VRx is wired but the menus only move up/down
+Y_CHANNEL = 1
+# OS | MUX=AIN<ch> vs GND | PGA ±6.144V | continuous | 860 SPS | comparator off
+CONTINUOUS_CONFIG = 0xC0E3
+UP_THRESHOLD = 10000
+DOWN_THRESHOLD = 60000
+MOVE_DELAY = 0.2
+POLL_INTERVAL = 0.01
+BUTTON_BOUNCE_MS = 150
+
+
+class JoystickInput:
+    """Turns the ADS1115 joystick and push button into navigation events.
+
+    The ADS1115 runs in continuous-conversion mode on the Y channel, so a
+    reading is a single register read with no per-sample sleep. The button
+    uses a GPIO falling-edge callback. Debounced UP / DOWN / PRESS events are
+    put on `events`; holding the stick repeats the move every `move_delay`."""
+
+    def __init__(self, bus, address=ADS1115_ADDRESS, button_pin=BUTTON_PIN,
+                 channel=Y_CHANNEL, move_delay=MOVE_DELAY):
+        self.bus = bus
+        self.address = address
+        self.button_pin = button_pin
+        self.channel = channel
+        self.move_delay = move_delay
+        self.events = queue.Queue()
+        self._running = False
+        self._configured = False
+        self._edge_detect = False
+        self._last_button = True
+        self._thread = None
+
+    def start(self):
+        self.arm_button()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="joystick", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(1)
+        try:
+            GPIO.remove_event_detect(self.button_pin)
+        except Exception:
+            pass
+
+    def arm_button(self):
+        # لازم تنعاد بعد أي GPIO.cleanup() على الـ pin
+        try:
+            GPIO.remove_event_detect(self.button_pin)
+        except Exception:
+            pass
+        try:
+            GPIO.setup(self.button_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            GPIO.add_event_detect(self.button_pin, GPIO.FALLING,
+                                  callback=self._on_button, bouncetime=BUTTON_BOUNCE_MS)
+            self._edge_detect = True
+        except Exception as e:
+            # بعض الـ kernels ترفض edge detection؛ نرجع لقراءة الزر داخل الـ thread
+            print(f"⚠️ Button edge detection unavailable, polling instead: {e}")
+            self._edge_detect = False
+            self._last_button = True
+
+    def get(self, timeout=None):
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _on_button(self, channel):
+        self.events.put(PRESS)
+
+    def _configure(self):
+        config = CONTINUOUS_CONFIG | (self.channel << 12)
+        self.bus.write_i2c_block_data(self.address, 0x01, [(config >> 8) & 0xFF, config & 0xFF])
+        self._configured = True
+
+    def _read(self):
+        if not self._configured:
+            self._configure()
+            time.sleep(0.002)  # first conversion at 860 SPS
+        data = self.bus.read_i2c_block_data(self.address, 0x00, 2)
+        return (data[0] << 8) | data[1]
+
+    def _poll_button(self):
+        try:
+            state = GPIO.input(self.button_pin)
+        except Exception:
+            return
+        if not state and self._last_button:
+            self.events.put(PRESS)
+        self._last_button = state
+
+    def _run(self):
+        last_move_time = 0
+        while self._running:
+            try:
+                vry = self._read()
+            except Exception:
+                self._configured = False
+                time.sleep(0.5)
+                continue
+
+            now = time.monotonic()
+            if now - last_move_time > self.move_delay:
+                if vry < UP_THRESHOLD:
+                    self.events.put(UP)
+                    last_move_time = now
+                elif vry > DOWN_THRESHOLD:
+                    self.events.put(DOWN)
+                    last_move_time = now
+
+            if not self._edge_detect:
+                self._poll_button()
+            time.sleep(POLL_INTERVAL)
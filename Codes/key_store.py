@@ -0,0 +1,197 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "keys.db")
+LEGACY_PATH = os.path.join(BASE_DIR, "keys.txt")
+
+_NAME_RE = re.compile(r"^kar(\d+)$")
+
+
+def key_name(key_id):
+    return f"kar{key_id}"
+
+
+def key_id(name):
+    match = _NAME_RE.match(name or "")
+    return int(match.group(1)) if match else None
+
+
+class KeyStore:
+    """Saved RF keys in SQLite (WAL mode), shared by main.py and the receivers.
+
+    `code` is UNIQUE, so dedup is an index lookup. Ids come from AUTOINCREMENT
+    and are never reused after a delete, which keeps the karN names stable.
+    Every write is its own transaction."""
+
+    def __init__(self, path=DB_PATH, legacy_path=LEGACY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS keys ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " code TEXT NOT NULL UNIQUE,"
+            " created REAL NOT NULL)"
+        )
+        # بصمات التوقيت (fingerprint.py)؛ key = "profile:code" زي replay_detector.code_key
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            " key TEXT NOT NULL,"
+            " code TEXT NOT NULL,"
+            " features BLOB NOT NULL,"
+            " created REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS fingerprints_code ON fingerprints (code)")
+        if legacy_path:
+            self._import_legacy(legacy_path)
+
+    def _import_legacy(self, legacy_path):
+        # نقل keys.txt القديم مرة وحدة فقط
+        if not os.path.exists(legacy_path) or self.count():
+            return
+        try:
+            with open(legacy_path, "r") as f:
+                lines = [line.strip().split(":", 1) for line in f if ":" in line]
+        except OSError as e:
+            print(f"⚠️ Error reading {legacy_path}: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for name, code in lines:
+                    old_id = key_id(name)
+                    taken = old_id is not None and self._db.execute(
+                        "SELECT 1 FROM keys WHERE id = ?", (old_id,)).fetchone()
+                    if old_id is None or taken:
+                        self._db.execute("INSERT OR IGNORE INTO keys (code, created) VALUES (?, ?)", (code, now))
+                    else:
+                        self._db.execute("INSERT OR IGNORE INTO keys (id, code, created) VALUES (?, ?, ?)",
+                                         (old_id, code, now))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        os.replace(legacy_path, legacy_path + ".imported")
+        print(f"📦 Imported {len(lines)} keys from {os.path.basename(legacy_path)}")
+
+    def save(self, code):
+        """Returns (name, is_new); an existing code keeps its old name."""
+        code = str(code)
+        with self._lock:
+            # look up first: a failed INSERT OR IGNORE would still burn an id
+            row = self._db.execute("SELECT id FROM keys WHERE code = ?", (code,)).fetchone()
+            if row is None:
+                cur = self._db.execute("INSERT OR IGNORE INTO keys (code, created) VALUES (?, ?)", (code, time.time()))
+                if cur.rowcount:
+                    return key_name(cur.lastrowid), True
+                # another process saved it between the two statements
+                row = self._db.execute("SELECT id FROM keys WHERE code = ?", (code,)).fetchone()
+        return key_name(row[0]), False
+
+    def delete(self, name):
+        kid = key_id(name)
+        if kid is None:
+            return False
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("DELETE FROM fingerprints WHERE code = (SELECT code FROM keys WHERE id = ?)", (kid,))
+                cur = self._db.execute("DELETE FROM keys WHERE id = ?", (kid,))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return cur.rowcount > 0
+
+    def add_fingerprint(self, key, features):
+        """Store one timing feature vector for `key` ("profile:code")."""
+        code = key.rsplit(":", 1)[-1]
+        with self._lock:
+            self._db.execute("INSERT INTO fingerprints (key, code, features, created) VALUES (?, ?, ?, ?)",
+                             (key, code, array("d", features).tobytes(), time.time()))
+
+    def has_fingerprints(self, key):
+        code = key.rsplit(":", 1)[-1]
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM fingerprints WHERE code = ? AND key = ? LIMIT 1",
+                                    (code, key)).fetchone() is not None
+
+    def fingerprints(self):
+        """Every stored (key, features) in insertion order."""
+        with self._lock:
+            rows = self._db.execute("SELECT key, features FROM fingerprints ORDER BY rowid").fetchall()
+        return [(key, tuple(array("d", blob))) for key, blob in rows]
+
+    def keys(self):
+        with self._lock:
+            rows = self._db.execute("SELECT id, code FROM keys ORDER BY id").fetchall()
+        return [(key_name(kid), code) for kid, code in rows]
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM keys").fetchone()[0]
+
+    def data_version(self):
+        # changes whenever another connection (e.g. recever.py) commits
+        with self._lock:
+            return self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class KeyCache:
+    """In-memory snapshot of a KeyStore for the UI loop.
+
+    `keys` is a plain tuple, so the render and input paths never touch the
+    database. Writes made through the cache reload it right away; writes from
+    other processes are picked up by a background thread that polls
+    PRAGMA data_version every `poll_interval` seconds."""
+
+    def __init__(self, store, poll_interval=0.5):
+        self.store = store
+        self.poll_interval = poll_interval
+        self.version = 0
+        self.keys = ()
+        self._data_version = None
+        self._stop = threading.Event()
+        self.reload()
+        self._thread = threading.Thread(target=self._watch, name="key-cache", daemon=True)
+        self._thread.start()
+
+    def reload(self):
+        self._data_version = self.store.data_version()
+        self.keys = tuple(self.store.keys())
+        self.version += 1
+
+    def save(self, code):
+        result = self.store.save(code)
+        if result[1]:
+            self.reload()
+        return result
+
+    def delete(self, name):
+        deleted = self.store.delete(name)
+        if deleted:
+            self.reload()
+        return deleted
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                if self.store.data_version() != self._data_version:
+                    self.reload()
+            except Exception as e:
+                print(f"⚠️ Error refreshing key cache: {e}")
@@ -0,0 +1,210 @@
+import subprocess
+import threading
+import time
+
+try:
+    import pigpio
+except ImportError:
+    pigpio = None
+
+HEALTH_CHECK_INTERVAL = 2.0
+
+# ثوابت pigpio هنا حتى الـ workers تشتغل مع rf_sim.SimulatedPi بدون مكتبة pigpio
+INPUT = 0
+OUTPUT = 1
+PUD_OFF = 0
+PUD_DOWN = 1
+PUD_UP = 2
+RISING_EDGE = 0
+FALLING_EDGE = 1
+EITHER_EDGE = 2
+
+if pigpio is not None:
+    pulse = pigpio.pulse
+else:
+    class pulse:
+        # نفس pigpio.pulse حتى الموجات تنبني مع SimulatedPi
+        def __init__(self, gpio_on, gpio_off, delay):
+            self.gpio_on = gpio_on
+            self.gpio_off = gpio_off
+            self.delay = delay
+
+
+def ensure_daemon():
+    # يشغّل pigpiod فقط إذا ما كان شغّال؛ ما نقتله أبداً
+    try:
+        subprocess.run(["pgrep", "pigpiod"], check=True, capture_output=True)
+        return False
+    except subprocess.CalledProcessError:
+        subprocess.run(["sudo", "pigpiod"], check=True)
+        time.sleep(0.5)
+        print("🔄 Started pigpiod daemon")
+        return True
+
+
+class PigpioLease:
+    """One consumer's share of the pigpio connection.
+
+    Any pigpio call is forwarded to the shared `pigpio.pi`. Callbacks and
+    watchdogs set through the lease are remembered, so `release()` undoes
+    exactly this consumer's hooks (and a reconnect can restore them) without
+    touching anyone else's or restarting the daemon. A pigpiod watchdog is
+    one per GPIO, so watchdogs go through the manager, which keeps the pin's
+    watchdog on while any lease still holds one."""
+
+    def __init__(self, manager, owner):
+        self.manager = manager
+        self.owner = owner
+        self._callbacks = []
+
+    def __getattr__(self, name):
+        return getattr(self.manager.get(), name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def callback(self, gpio, edge, func):
+        entry = [gpio, edge, func, self.manager.get().callback(gpio, edge, func)]
+        self._callbacks.append(entry)
+        return entry[3]
+
+    def set_watchdog(self, gpio, timeout):
+        return self.manager.set_watchdog(self, gpio, timeout)
+
+    def release(self):
+        for entry in self._callbacks:
+            try:
+                entry[3].cancel()
+            except Exception:
+                pass
+        self._callbacks = []
+        self.manager.release(self)
+
+    def restore(self, pi):
+        for entry in self._callbacks:
+            entry[3] = pi.callback(entry[0], entry[1], entry[2])
+
+
+class PigpioManager:
+    """A single pigpio connection shared by the UI, the workers and TX.
+
+    `get()` hands out the live connection, pinging the daemon at most every
+    `check_interval` seconds; only a failed ping or a dropped socket causes a
+    reconnect, after which every open lease gets its callbacks back.
+    `factory` makes the connection; rf_sim passes one returning a
+    SimulatedPi so the workers run without hardware."""
+
+    def __init__(self, check_interval=HEALTH_CHECK_INTERVAL, start_daemon=True, factory=None):
+        self.check_interval = check_interval
+        self.start_daemon = start_daemon
+        self.factory = factory
+        self.reconnects = 0
+        self._pi = None
+        self._last_check = 0
+        self._leases = []
+        # gpio -> {lease: timeout}؛ pigpiod عنده watchdog واحد لكل pin
+        self._watchdogs = {}
+        self._lock = threading.RLock()
+
+    def get(self):
+        with self._lock:
+            if self._pi is None or not self._healthy():
+                self._connect()
+            return self._pi
+
+    def lease(self, owner):
+        with self._lock:
+            self.get()
+            lease = PigpioLease(self, owner)
+            self._leases.append(lease)
+            return lease
+
+    def release(self, lease):
+        with self._lock:
+            for gpio, holders in list(self._watchdogs.items()):
+                if lease in holders:
+                    try:
+                        self.set_watchdog(lease, gpio, 0)
+                    except Exception:
+                        pass
+            if lease in self._leases:
+                self._leases.remove(lease)
+
+    def set_watchdog(self, lease, gpio, timeout):
+        """Set or clear `lease`'s watchdog on `gpio`. The pin gets the shortest
+        timeout still held and is only cleared when the last holder lets go."""
+        with self._lock:
+            holders = self._watchdogs.setdefault(gpio, {})
+            if timeout:
+                holders[lease] = timeout
+            else:
+                holders.pop(lease, None)
+            if not holders:
+                del self._watchdogs[gpio]
+            return self.get().set_watchdog(gpio, min(holders.values(), default=0))
+
+    def health(self):
+        with self._lock:
+            return {
+                "connected": self._pi is not None and self._healthy(),
+                "reconnects": self.reconnects,
+                "leases": [lease.owner for lease in self._leases],
+            }
+
+    def close(self):
+        with self._lock:
+            for lease in list(self._leases):
+                lease.release()
+            if self._pi is not None:
+                self._pi.stop()
+                self._pi = None
+
+    def _healthy(self):
+        if not self._pi.connected:
+            return False
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return True
+        try:
+            self._pi.get_current_tick()
+        except Exception:
+            return False
+        self._last_check = now
+        return True
+
+    def _connect(self):
+        if self._pi is not None:
+            print("⚠️ pigpio connection lost, reconnecting")
+            self.reconnects += 1
+            try:
+                self._pi.stop()
+            except Exception:
+                pass
+            self._pi = None
+        if self.factory is not None:
+            pi = self.factory()
+        elif pigpio is None:
+            raise RuntimeError("The pigpio module is not installed")
+        else:
+            pi = pigpio.pi()
+            if not pi.connected and self.start_daemon:
+                ensure_daemon()
+                pi = pigpio.pi()
+        if not pi.connected:
+            raise RuntimeError("Failed to connect to pigpio! Run: sudo pigpiod")
+        self._pi = pi
+        self._last_check = time.monotonic()
+        for lease in self._leases:
+            lease.restore(pi)
+        for gpio, holders in self._watchdogs.items():
+            pi.set_watchdog(gpio, min(holders.values()))
+
+
+manager = PigpioManager()
+
+
+def lease(owner):
+    return manager.lease(owner)
@@ -0,0 +1,149 @@
+import sys
+import pigpio_pool
+import rf_notify
+from rf_decoder import PROFILES, FrameDecoder, EdgeCollector
+from rf_pipeline import DecodePipeline
+from rf_protocols import PROTOCOLS, IncrementalDecoder
+from fingerprint import extract_features
+from rf_messages import AuditResult, CloneAlert, CodeFrame, KeySaved, ReplayAlert, Status, Stopped
+from replay_detector import code_key
+from trace_file import TraceWriter
+
+GPIO_PIN = 21
+
+
+class Receiver:
+    """Decodes the given bit widths from GPIO_PIN until `stop` is set.
+
+    `names` may also hold rf_protocols names; those are decoded edge by edge
+    and reported as soon as their last bit arrives, alongside the watchdog
+    framed widths. Every decoded frame is emitted as a CodeFrame; profiles
+    and protocols with save_keys are also stored in `key_store` and reported
+    as KeySaved. With `trace_path` the raw edges are also recorded to a trace
+    file. With `notify` edges come in blocks from the shared rf_notify pipe
+    instead of one pigpio callback per edge. With a `replay_index`
+    (replay_detector.SeenCodeIndex) every frame is checked against the codes
+    seen before and a ReplayAlert follows the CodeFrame of a replayed one.
+    With `fingerprints` (fingerprint.FingerprintIndex) the timing of every
+    frame is matched against the transmitter enrolled for that code and a
+    CloneAlert follows a frame that came from a different one. With an
+    `audit` (code_audit.CodeAudit) every new press is added to the fixed /
+    rolling analysis and its current AuditResult is emitted."""
+
+    def __init__(self, names=None, key_store=None, gpio=GPIO_PIN, trace_path=None, notify=False,
+                 replay_index=None, fingerprints=None, audit=None):
+        self.names = list(names or PROFILES)
+        self.key_store = key_store
+        self.gpio = gpio
+        self.trace_path = trace_path
+        self.notify = notify
+        self.replay_index = replay_index
+        self.fingerprints = fingerprints
+        self.audit = audit
+        self.stats = None
+
+    def run(self, stop, emit):
+        def on_frame(profile, dec_val, nbits, decoder):
+            output = f"{dec_val}"
+            pulses, mean, stddev, frame_time = decoder.last_frame
+            emit(CodeFrame(output, nbits, profile.name, pulses, round(float(stddev), 1), time=frame_time))
+            if self.replay_index is not None:
+                replay = self.replay_index.observe(code_key(profile.name, output), frame_time)
+                if replay is not None:
+                    emit(ReplayAlert(output, profile.name, replay.first_seen, replay.last_seen,
+                                     replay.count, replay.source, time=frame_time))
+                self.replay_index.maybe_save(frame_time)
+            if self.fingerprints is not None:
+                features = extract_features(decoder.last_timings)
+                if features is not None:
+                    match = self.fingerprints.check(code_key(profile.name, output), features)
+                    if match is not None and match.clone:
+                        emit(CloneAlert(output, profile.name, round(match.distance, 1), match.nearest,
+                                        round(match.nearest_distance, 1), time=frame_time))
+            if self.audit is not None and self.audit.observe(dec_val, nbits, frame_time):
+                emit(AuditResult(profile.name, **self.audit.summary(), time=frame_time))
+            if profile.save_keys and self.key_store is not None:
+                # حفظ الرمز في keys.db (بدون تكرار)
+                key_name, is_new = self.key_store.save(output)
+                emit(KeySaved(key_name, output, is_new))
+
+        pi = pigpio_pool.lease("capture")
+        feeds = []
+
+        def listen(callback, feed=None):
+            if self.notify:
+                feed = feed or rf_notify.per_edge(callback, self.gpio)
+                feeds.append(feed)
+                rf_notify.subscribe(self.gpio, feed)
+            else:
+                pi.callback(self.gpio, pigpio_pool.EITHER_EDGE, callback)
+
+        profiles = [PROFILES[name] for name in self.names if name in PROFILES]
+        protocols = [PROTOCOLS[name] for name in self.names if name in PROTOCOLS]
+        recorder = None
+        pipeline = None
+        incremental = None
+        # الإعداد داخل الـ try: لو فشل subscribe (notify_open / /dev/pigpioN) الـ finally ينظف كل شي
+        try:
+            pi.set_mode(self.gpio, pigpio_pool.INPUT)
+            pi.set_pull_up_down(self.gpio, pigpio_pool.PUD_DOWN)
+            recorder = TraceWriter(self.trace_path, self.gpio) if self.trace_path else None
+            if profiles:
+                decoder = FrameDecoder(profiles, lambda *frame: on_frame(*frame, decoder))
+                # الفك يصير في thread منفصل حتى ما نضيّع edges أثناء الحساب
+                pipeline = DecodePipeline(decoder).start()
+                collector = EdgeCollector(pipeline, decoder.min_pulses, recorder)
+                listen(collector.rf_callback, collector.feed)
+                pi.set_watchdog(self.gpio, 10)
+            elif recorder is not None:
+                listen(recorder.record)
+            if protocols:
+                # خفيف كفاية ينفّذ في الـ callback نفسه
+                incremental = IncrementalDecoder(protocols, lambda *frame: on_frame(*frame, incremental))
+                listen(incremental.rf_callback)
+            emit(Status(f"📡 Listening {'/'.join(self.names)} bit (Filtered + Dedup)..."))
+            stop.wait()
+        finally:
+            for feed in feeds:
+                rf_notify.unsubscribe(self.gpio, feed)
+            pi.release()
+            if pipeline is not None:
+                pipeline.stop()
+            if self.replay_index is not None:
+                try:
+                    self.replay_index.save()
+                except OSError as e:
+                    print(f"⚠️ Error saving code index: {e}")
+            if recorder is not None:
+                recorder.close()
+                emit(Status(f"💾 Recorded {recorder.records} edges to {self.trace_path}"))
+            if pipeline is not None:
+                self.stats = pipeline.stats()
+                emit(Stopped(f"🛑 Stopped. Frames: {self.stats['enqueued']} queued, "
+                             f"{self.stats['decoded']} decoded, {self.stats['dropped']} dropped"))
+            elif incremental is not None:
+                emit(Stopped(f"🛑 Stopped. Frames: {incremental.frames} decoded"))
+
+
+if __name__ == "__main__":
+    from key_store import KeyStore
+    from supervisor import run_cli
+
+    # الاستخدام: python3 recever.py [--ndjson] [--notify] [--record FILE] [24] [32] [64] [128] [ev1527] [pt2262] [keeloq]
+    # (بدون وسائط = كل الأطوال)
+    args = sys.argv[1:]
+    ndjson = "--ndjson" in args
+    notify = "--notify" in args
+    trace_path = None
+    if "--record" in args:
+        i = args.index("--record")
+        if i + 1 >= len(args):
+            exit("❌ --record needs a file name")
+        trace_path = args.pop(i + 1)
+        args.pop(i)
+    names = [arg for arg in args if arg not in ("--ndjson", "--notify")] or list(PROFILES)
+    unknown = [name for name in names if name not in PROFILES and name not in PROTOCOLS]
+    if unknown:
+        exit(f"❌ Unknown bit length or protocol: {', '.join(unknown)} (use {', '.join([*PROFILES, *PROTOCOLS])})")
+    run_cli(Receiver(names, KeyStore(), trace_path=trace_path, notify=notify), ndjson=ndjson)
+    pigpio_pool.manager.close()
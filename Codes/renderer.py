@@ -0,0 +1,90 @@
+import time
+from PIL import Image, ImageDraw, ImageChops
+from luma.lcd.device import st7735
+
+try:
+    from luma.core.framebuffer import diff_to_previous
+except ImportError:
+    diff_to_previous = None
+
+MAX_FPS = 20
+
+
+def create_st7735(serial, **kwargs):
+    # diff_to_previous makes device.display() send only the changed bounding
+    # box through a partial column/row window instead of all 128x128 pixels
+    if diff_to_previous is not None:
+        try:
+            return st7735(serial, framebuffer=diff_to_previous(num_segments=1), **kwargs)
+        except TypeError:
+            pass
+    return st7735(serial, **kwargs)
+
+
+class FrameDraw(ImageDraw.ImageDraw):
+    """ImageDraw that can also paste pre-rendered tiles into its frame."""
+
+    def __init__(self, image):
+        super().__init__(image)
+        self.image = image
+
+    def paste(self, tile, xy):
+        self.image.paste(tile, xy)
+
+
+class FrameRenderer:
+    """Redraws the screen only when the UI state changes.
+
+    `state` is any hashable snapshot of what the current page shows. When it
+    matches the last rendered one nothing is drawn or sent over SPI; when it
+    differs the frame is drawn off-screen, compared with the previous frame,
+    and pushed only if some pixels actually changed. Pushes are capped at
+    `max_fps`; a capped change is simply drawn on a later call."""
+
+    def __init__(self, device, max_fps=MAX_FPS):
+        self.device = device
+        self.min_interval = 1.0 / max_fps
+        self.state = None
+        self.image = None
+        self.last_push = 0
+        self.rendered = 0
+        self.skipped = 0
+        self.last_bbox = None
+
+    def invalidate(self, device=None):
+        # after the display was re-initialized everything has to be resent
+        if device is not None:
+            self.device = device
+        self.state = None
+        self.image = None
+
+    def render(self, state, draw_page):
+        if state is not None and state == self.state:
+            self.skipped += 1
+            return False
+        now = time.monotonic()
+        if now - self.last_push < self.min_interval:
+            self.skipped += 1
+            return False
+
+        frame = Image.new(self.device.mode, self.device.size, "black")
+        draw_page(FrameDraw(frame))
+        self.state = state
+
+        if self.image is None:
+            bbox = (0, 0) + frame.size
+        else:
+            bbox = ImageChops.difference(frame, self.image).getbbox()
+        if bbox is None:
+            self.skipped += 1
+            return False
+
+        self.device.display(frame)
+        self.image = frame
+        self.last_bbox = bbox
+        self.last_push = now
+        self.rendered += 1
+        return True
+
+    def stats(self):
+        return {"rendered": self.rendered, "skipped": self.skipped, "last_bbox": self.last_bbox}
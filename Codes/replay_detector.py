@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(BASE_DIR, "seen_codes.json")
+BLOOM_PATH = os.path.join(BASE_DIR, "seen_codes.bloom")
+# الريموت يكرر نفس الإطار ~10 مرات وقت الضغطة؛ أي ظهور بعد هذه المدة يعتبر replay
+BURST_S = 2.0
+RECENT_CODES = 10000
+# 1 Mbit و 7 hashes: حوالي 1% false positives بعد 100 ألف كود
+BLOOM_BITS = 1 << 20
+BLOOM_HASHES = 7
+SAVE_INTERVAL = 60
+
+BLOOM_HEADER = struct.Struct("<8sIII")
+BLOOM_MAGIC = b"RFBLOOM1"
+
+
+class BloomFilter:
+    """Fixed-size set membership for every code ever seen.
+
+    `k` bit positions come from one blake2b digest by double hashing, so
+    add() and `in` are O(k) and the filter never grows. A hit can be a false
+    positive (`false_positive_rate()`), a miss is always right."""
+
+    def __init__(self, bits=BLOOM_BITS, hashes=BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self.count = 0
+        self.array = bytearray((bits + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, key):
+        for i in self._positions(key):
+            self.array[i >> 3] |= 1 << (i & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.array[i >> 3] & (1 << (i & 7)) for i in self._positions(key))
+
+    def false_positive_rate(self):
+        return (1 - (1 - 1 / self.bits) ** (self.hashes * self.count)) ** self.hashes
+
+    def save(self, path=BLOOM_PATH):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self.bits, self.hashes, self.count))
+            f.write(self.array)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=BLOOM_PATH):
+        with open(path, "rb") as f:
+            magic, bits, hashes, count = BLOOM_HEADER.unpack(f.read(BLOOM_HEADER.size))
+            if magic != BLOOM_MAGIC:
+                raise ValueError(f"{path} is not a Bloom filter file")
+            bloom = cls(bits, hashes)
+            data = f.read()
+        if len(data) != len(bloom.array):
+            raise ValueError(f"{path} is truncated")
+        bloom.array[:] = data
+        bloom.count = count
+        return bloom
+
+
+class ReplayCheck:
+    """Result of SeenCodeIndex.observe() for a code that was seen before a
+    burst ago. `source` is "recent" (timestamps known) or "history" (only
+    the Bloom filter remembers it, so it may be a false positive)."""
+
+    def __init__(self, key, source, first_seen=None, last_seen=None, count=0):
+        self.key = key
+        self.source = source
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.count = count
+
+
+class SeenCodeIndex:
+    """Every decoded code with first/last-seen times, for replay detection.
+
+    The last RECENT_CODES codes are kept in an ordered dict (key -> [first,
+    last, count]) and every code ever seen is also added to a Bloom filter,
+    so the long tail costs a fixed 128 KiB. observe() is O(1): a code seen
+    again within `burst_s` of its last sighting is the same button press
+    (the window slides while repeats keep coming); anything later, or a code
+    only the Bloom filter knows, is reported as a replay. Both parts are
+    saved to disk and reloaded, so history survives restarts."""
+
+    def __init__(self, index_path=INDEX_PATH, bloom_path=BLOOM_PATH, burst_s=BURST_S,
+                 recent_codes=RECENT_CODES):
+        self.index_path = index_path
+        self.bloom_path = bloom_path
+        self.burst_s = burst_s
+        self.recent_codes = recent_codes
+        self.recent = OrderedDict()
+        self.bloom = BloomFilter()
+        self.alerts = 0
+        self.last_save = None
+        # الـ pipeline thread و الـ callback thread ممكن يستدعوا observe مع بعض
+        self._lock = threading.Lock()
+
+    def observe(self, key, now):
+        """Record a sighting of `key`; returns a ReplayCheck if it is a replay."""
+        with self._lock:
+            entry = self.recent.get(key)
+            if entry is not None:
+                first, last, count = entry
+                entry[1] = now
+                entry[2] = count + 1
+                self.recent.move_to_end(key)
+                if now - last <= self.burst_s:
+                    return None
+                self.alerts += 1
+                return ReplayCheck(key, "recent", first, last, count)
+            known = key in self.bloom
+            self.recent[key] = [now, now, 1]
+            if len(self.recent) > self.recent_codes:
+                self.recent.popitem(last=False)
+            if known:
+                self.alerts += 1
+                return ReplayCheck(key, "history")
+            self.bloom.add(key)
+            return None
+
+    def load(self):
+        """Load both files if present; returns how many recent codes came back."""
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            self.recent = OrderedDict((key, list(entry)) for key, entry in data["recent"])
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Ignoring unreadable code index {self.index_path}: {e}")
+        try:
+            self.bloom = BloomFilter.load(self.bloom_path)
+        except FileNotFoundError:
+            pass
+        except (ValueError, struct.error) as e:
+            print(f"⚠️ Ignoring unreadable Bloom filter {self.bloom_path}: {e}")
+        return len(self.recent)
+
+    def save(self):
+        with self._lock:
+            recent = [[key, entry] for key, entry in self.recent.items()]
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump({"burst_s": self.burst_s, "recent": recent}, f)
+            os.replace(tmp, self.index_path)
+            self.bloom.save(self.bloom_path)
+
+    def maybe_save(self, now, interval=SAVE_INTERVAL):
+        if self.last_save is None:
+            self.last_save = now
+        elif now - self.last_save >= interval:
+            self.last_save = now
+            try:
+                self.save()
+            except OSError as e:
+                print(f"⚠️ Error saving code index: {e}")
+
+
+def code_key(profile_name, value):
+    return f"{profile_name}:{value}"
+
+
+if __name__ == "__main__":
+    import sys
+    import pigpio_pool
+    from recever import Receiver
+    from rf_decoder import PROFILES
+    from rf_protocols import PROTOCOLS
+    from supervisor import run_cli
+
+    # الاستخدام: python3 replay_detector.py [--ndjson] [--notify] [24 32 64 128 ev1527 pt2262 keeloq]
+    args = sys.argv[1:]
+    names = [arg for arg in args if not arg.startswith("--")] or [*PROFILES, "keeloq"]
+    unknown = [name for name in names if name not in PROFILES and name not in PROTOCOLS]
+    if unknown:
+        exit(f"❌ Unknown bit length or protocol: {', '.join(unknown)} (use {', '.join([*PROFILES, *PROTOCOLS])})")
+    index = SeenCodeIndex()
+    print(f"🗂️ Code index: {index.load()} recent codes, {index.bloom.count} in history")
+    run_cli(Receiver(names, notify="--notify" in args, replay_index=index), ndjson="--ndjson" in args)
+    pigpio_pool.manager.close()
@@ -0,0 +1,286 @@
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# pigpio.TIMEOUT: level reported by the watchdog when the line has been idle
+TIMEOUT = 2
+MIN_EDGE_US = 100
+MAX_EDGE_US = 5000
+REPEAT_SUPPRESSION_MS = 100
+# "numpy" when available, "python" otherwise; both give the same results
+BACKEND = "numpy" if np is not None else "python"
+
+
+class DecoderProfile:
+    def __init__(self, name, min_pulses, max_std_dev, min_bits, max_bits, save_keys=False):
+        self.name = name
+        self.min_pulses = min_pulses
+        self.max_std_dev = max_std_dev
+        self.min_bits = min_bits
+        self.max_bits = max_bits
+        self.save_keys = save_keys
+
+    def accepts(self, pulses, stddev, bits_len):
+        return (pulses >= self.min_pulses
+                and stddev < self.max_std_dev
+                and self.min_bits <= bits_len <= self.max_bits)
+
+    def __repr__(self):
+        return f"DecoderProfile({self.name}, {self.min_bits}-{self.max_bits} bits)"
+
+
+# نفس القيم اللي كانت في recever24/32/64/128.py
+PROFILES = {
+    "24": DecoderProfile("24", min_pulses=20, max_std_dev=1100, min_bits=24, max_bits=24, save_keys=True),
+    "32": DecoderProfile("32", min_pulses=10, max_std_dev=1200, min_bits=30, max_bits=35),
+    "64": DecoderProfile("64", min_pulses=10, max_std_dev=1200, min_bits=61, max_bits=66),
+    "128": DecoderProfile("128", min_pulses=10, max_std_dev=1200, min_bits=126, max_bits=130),
+}
+
+
+def tick_diff(t1, t2):
+    # same wrap-around arithmetic as pigpio.tickDiff
+    return (t2 - t1) & 0xFFFFFFFF
+
+
+def decode_bits(bits):
+    try:
+        decimal_value = int(bits, 2)
+        hex_value = hex(decimal_value)
+        return decimal_value, hex_value
+    except ValueError:
+        return None, None
+
+
+def frame_stats(data):
+    # mean / population stddev from exact integer sums, so the Python and
+    # NumPy paths see bit-identical thresholds
+    n = len(data)
+    if np is not None and BACKEND == "numpy":
+        arr = _as_array(data)
+        total = int(arr.sum())
+        total_sq = int(np.dot(arr, arr))
+    else:
+        total = sum(data)
+        total_sq = sum(x * x for x in data)
+    mean = total / n
+    variance = (n * total_sq - total * total) / (n * n)
+    return mean, variance ** 0.5
+
+
+def get_stddev(data):
+    return frame_stats(data)[1]
+
+
+def filter_outliers(data, std_multiplier=2, stats=None):
+    if len(data) < 2:
+        return data
+    mean, stddev = stats or frame_stats(data)
+    return [x for x in data if (mean - std_multiplier * stddev) <= x <= (mean + std_multiplier * stddev)]
+
+
+def _as_array(data):
+    if isinstance(data, np.ndarray):
+        return data.astype(np.int64, copy=False)
+    if isinstance(data, memoryview):
+        # EdgeBuffer slice: read the uint16 slot in place, widen for the sums
+        return np.frombuffer(data, dtype=np.uint16).astype(np.int64)
+    return np.asarray(data, dtype=np.int64)
+
+
+def _timings_to_code_py(timings, stats=None):
+    filtered_timings = filter_outliers(timings, stats=stats)
+
+    highs = filtered_timings[::2]
+    lows = filtered_timings[1::2]
+
+    if len(highs) < 2 or len(lows) < 2:
+        return None
+
+    avg_high = sum(highs) / len(highs)
+    avg_low = sum(lows) / len(lows)
+
+    value = 0
+    nbits = 0
+    for high, low in zip(highs, lows):
+        if high < avg_high and low > avg_low:
+            value <<= 1
+            nbits += 1
+        elif high > avg_high and low < avg_low:
+            value = (value << 1) | 1
+            nbits += 1
+
+    if not nbits:
+        return None
+    return value, nbits
+
+
+def _timings_to_code_np(timings, stats=None):
+    data = _as_array(timings)
+    if data.size >= 2:
+        mean, stddev = stats or frame_stats(data)
+        data = data[(data >= mean - 2 * stddev) & (data <= mean + 2 * stddev)]
+
+    highs = data[::2]
+    lows = data[1::2]
+
+    if highs.size < 2 or lows.size < 2:
+        return None
+
+    avg_high = int(highs.sum()) / highs.size
+    avg_low = int(lows.sum()) / lows.size
+
+    # a trailing unpaired high counts towards avg_high but is not a bit
+    highs = highs[:lows.size]
+    zeros = (highs < avg_high) & (lows > avg_low)
+    ones = (highs > avg_high) & (lows < avg_low)
+    bits = ones[zeros | ones]
+
+    nbits = bits.size
+    if not nbits:
+        return None
+    packed = np.packbits(bits)
+    value = int.from_bytes(packed.tobytes(), "big") >> (packed.size * 8 - nbits)
+    return value, nbits
+
+
+def timings_to_code(timings, stats=None):
+    # returns (value, nbits) with the bits packed MSB first, or None
+    if np is not None and BACKEND == "numpy":
+        return _timings_to_code_np(timings, stats)
+    return _timings_to_code_py(timings, stats)
+
+
+def timings_to_bits(timings):
+    # no length check here: the caller picks the profile from len(bits)
+    code = timings_to_code(timings)
+    if code is None:
+        return None
+    value, nbits = code
+    return format(value, f"0{nbits}b")
+
+
+class FrameDecoder:
+    """Decodes frames of every length in one pass and routes each one to the
+    profile whose bit range matches it. While `on_frame` runs, `last_frame`
+    holds (pulses, mean, stddev, time) of the frame being reported and
+    `last_timings` its durations (an EdgeBuffer slice, only valid until
+    on_frame returns). `clock` drives repeat suppression; a replay passes
+    its simulated time."""
+
+    def __init__(self, profiles, on_frame, clock=time.time):
+        self.profiles = list(profiles)
+        self.on_frame = on_frame
+        self.clock = clock
+        self.min_pulses = min(p.min_pulses for p in self.profiles)
+        self.max_std_dev = max(p.max_std_dev for p in self.profiles)
+        self.last_code = None
+        self.last_code_time = 0
+        self.last_frame = None
+        self.last_timings = None
+
+    def match_profile(self, pulses, stddev, bits_len):
+        for profile in self.profiles:
+            if profile.accepts(pulses, stddev, bits_len):
+                return profile
+        return None
+
+    def process_timings(self, timings):
+        if len(timings) < self.min_pulses:
+            return None
+        if np is not None and BACKEND == "numpy":
+            timings = _as_array(timings)
+        stats = frame_stats(timings)
+        stddev = stats[1]
+        if stddev >= self.max_std_dev:
+            return None
+
+        code = timings_to_code(timings, stats)
+        if code is None:
+            return None
+        value, nbits = code
+        profile = self.match_profile(len(timings), stddev, nbits)
+        if profile is None:
+            return None
+
+        now_time = self.clock()
+        if code == self.last_code and (now_time - self.last_code_time) * 1000 <= REPEAT_SUPPRESSION_MS:
+            return None
+        self.last_code = code
+        self.last_code_time = now_time
+        self.last_frame = (len(timings), stats[0], stddev, now_time)
+        self.last_timings = timings
+        try:
+            self.on_frame(profile, value, nbits)
+        finally:
+            self.last_timings = None
+        return profile
+
+
+class EdgeCollector:
+    """pigpio edge callback that cuts the edge stream into frames on the
+    watchdog timeout. Edges go straight into the pipeline's preallocated
+    EdgeBuffer and each frame is submitted as a memoryview slice of it.
+    Frames shorter than `min_pulses` never leave the callback. With a
+    `recorder` (trace_file.TraceWriter) every raw event is also recorded."""
+
+    def __init__(self, pipeline, min_pulses=0, recorder=None):
+        self.pipeline = pipeline
+        self.buffer = pipeline.buffer
+        self.min_pulses = min_pulses
+        self.recorder = recorder
+        self.last_tick = None
+
+    def rf_callback(self, gpio, level, tick):
+        if self.recorder is not None:
+            self.recorder.record(gpio, level, tick)
+        buffer = self.buffer
+        if level == TIMEOUT:
+            self.end_frame()
+            return
+
+        if self.last_tick is not None:
+            duration = tick_diff(self.last_tick, tick)
+            if MIN_EDGE_US < duration < MAX_EDGE_US:
+                buffer.append(duration)
+
+        self.last_tick = tick
+
+    def end_frame(self):
+        buffer = self.buffer
+        if buffer.length:
+            if (buffer.length >= self.min_pulses and not buffer.overflowed
+                    and self.pipeline.submit(buffer.frame())):
+                buffer.commit()
+            else:
+                buffer.discard()
+
+    def feed(self, ticks, levels):
+        """Bulk form of rf_callback for a block of (ticks, levels) from
+        rf_notify: durations between TIMEOUTs are computed and copied into
+        the buffer a whole run at a time."""
+        if np is None:
+            for tick, level in zip(ticks, levels):
+                self.rf_callback(None, level, tick)
+            return
+        if self.recorder is not None:
+            for tick, level in zip(ticks.tolist(), levels.tolist()):
+                self.recorder.record(None, level, tick)
+        ticks = np.asarray(ticks, np.int64)
+        levels = np.asarray(levels)
+        start = 0
+        for end in np.flatnonzero(levels == TIMEOUT).tolist() + [len(ticks)]:
+            run = ticks[start:end]
+            if len(run):
+                if self.last_tick is not None:
+                    run = np.concatenate(([self.last_tick], run))
+                durations = np.diff(run) & 0xFFFFFFFF
+                durations = durations[(durations > MIN_EDGE_US) & (durations < MAX_EDGE_US)]
+                self.buffer.extend(durations.astype(np.uint16))
+                self.last_tick = int(run[-1])
+            if end < len(ticks):
+                self.end_frame()
+            start = end + 1
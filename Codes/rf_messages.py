@@ -0,0 +1,146 @@
+import json
+import time
+
+
+class Message:
+    """Base for everything a worker reports to the UI.
+
+    Subclasses list their payload in `fields`; the supervisor fills in
+    `worker`, and `time` defaults to now. On the wire a message is one JSON
+    object per line (NDJSON) with a "kind" key, see encode()/decode()."""
+
+    kind = "message"
+    fields = ()
+
+    def __init__(self, *values, **named):
+        if len(values) > len(self.fields):
+            raise TypeError(f"{self.kind} takes {len(self.fields)} fields")
+        for name, value in zip(self.fields, values):
+            setattr(self, name, value)
+        for name in self.fields[len(values):]:
+            setattr(self, name, named.pop(name, None))
+        self.worker = named.pop("worker", None)
+        self.time = named.pop("time", None)
+        if self.time is None:
+            self.time = time.time()
+        if named:
+            raise TypeError(f"Unknown {self.kind} fields: {', '.join(named)}")
+
+    def to_dict(self):
+        data = {"kind": self.kind, "worker": self.worker, "time": self.time}
+        for name in self.fields:
+            data[name] = getattr(self, name)
+        return data
+
+    def label(self):
+        """Short text for the 128px screen and the console."""
+        return self.kind
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{type(self).__name__}({values})"
+
+
+class JammingLevel(Message):
+    # windows = [[ms, edges/s, duty cycle, entropy], ...] من الأقصر للأطول
+    # threshold = edges/s اللي يعتبر تشويش الآن، z = انحراف النافذة القصيرة عن الـ baseline
+    kind = "jamming"
+    fields = ("percent", "status", "pulses", "windows", "threshold", "z")
+
+    def label(self):
+        return f"J:{self.percent:.1f}% | S:{self.status}"
+
+
+class CodeFrame(Message):
+    # pulses / stddev هي جودة الإطار: عدد الحواف وانحراف مددها بالـ µs
+    kind = "code"
+    fields = ("value", "bits", "profile", "pulses", "stddev")
+
+    def label(self):
+        return f"{self.value}"
+
+
+class KeySaved(Message):
+    kind = "key"
+    fields = ("name", "value", "is_new")
+
+    def label(self):
+        return f"Key saved {self.name}" if self.is_new else f"Key exists {self.name}"
+
+
+class ReplayAlert(Message):
+    # source: "recent" (first/last_seen معروفة) أو "history" (الـ Bloom filter بس، ممكن false positive)
+    kind = "replay"
+    fields = ("value", "profile", "first_seen", "last_seen", "count", "source")
+
+    def label(self):
+        return f"⚠️ Replay {self.value}"
+
+
+class RollJamAlert(Message):
+    # jam_start / captured / replayed هي أوقات (time.time)؛ delay بالثواني بين الالتقاط والإعادة
+    kind = "rolljam"
+    fields = ("value", "profile", "jam_start", "captured", "replayed", "delay")
+
+    def label(self):
+        return f"🚨 RollJam {self.value}"
+
+
+class CloneAlert(Message):
+    # distance: بعد التوقيت عن بصمات نفس الكود؛ nearest: أقرب ريموت مسجّل (ممكن يكون نفس الكود)
+    kind = "clone"
+    fields = ("value", "profile", "distance", "nearest", "nearest_distance")
+
+    def label(self):
+        return f"🧬 Clone {self.value}"
+
+
+class AuditResult(Message):
+    # verdict من code_audit: "analyzing" / "fixed" / "rolling" / "partly static"
+    # held: الزر انضغط مطوّل فالضغطات اندمجت
+    kind = "audit"
+    fields = ("profile", "nbits", "presses", "verdict", "clusters", "static_bits", "entropy", "hamming", "held")
+
+    def label(self):
+        if self.held:
+            return "Release between presses"
+        verdict = self.verdict[0].upper() + self.verdict[1:]
+        return f"{verdict} ({self.presses} press{'' if self.presses == 1 else 'es'})"
+
+
+class Status(Message):
+    kind = "status"
+    fields = ("text",)
+
+    def label(self):
+        return self.text
+
+
+class WorkerError(Status):
+    kind = "error"
+
+
+class Stopped(Status):
+    kind = "stopped"
+
+
+KINDS = {cls.kind: cls for cls in (JammingLevel, CodeFrame, KeySaved, ReplayAlert, RollJamAlert, CloneAlert, AuditResult, Status, WorkerError, Stopped)}
+
+
+def encode(message):
+    return (json.dumps(message.to_dict(), separators=(",", ":")) + "\n").encode()
+
+
+def decode(line):
+    data = json.loads(line)
+    cls = KINDS.get(data.pop("kind", None))
+    if cls is None:
+        raise ValueError(f"Unknown message kind in: {line!r}")
+    return cls(**data)
+
+
+def read_messages(stream):
+    """Yield messages from an NDJSON stream, e.g. `python3 recever.py --ndjson`."""
+    for line in stream:
+        if line.strip():
+            yield decode(line)
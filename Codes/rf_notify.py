@@ -0,0 +1,213 @@
+import os
+import select
+import struct
+import threading
+
+import pigpio_pool
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TIMEOUT = 2
+# gpioReport_t من pigpio.h: seqno, flags, tick, level (bitmask لكل الـ GPIOs)
+REPORT = struct.Struct("<HHII")
+REPORT_DTYPE = np.dtype([("seqno", "<u2"), ("flags", "<u2"), ("tick", "<u4"), ("level", "<u4")]) if np is not None else None
+NTFY_FLAGS_EVENT = 1 << 7
+NTFY_FLAGS_ALIVE = 1 << 6
+NTFY_FLAGS_WDOG = 1 << 5
+NTFY_FLAGS_GPIO = 31
+PIPE_PATH = "/dev/pigpio{}"
+BLOCK_RECORDS = 4096
+POLL_INTERVAL = 0.1
+
+
+def parse_reports(data, gpio, last_level):
+    """Turn a block of gpioReport records into (ticks, levels, last_level).
+
+    Only records where `gpio` changed level become edges; a watchdog report
+    for `gpio` becomes level TIMEOUT, as in a pigpio callback. Keep-alive and
+    event reports are skipped."""
+    if np is not None:
+        reports = np.frombuffer(data, REPORT_DTYPE)
+        flags = reports["flags"]
+        bits = ((reports["level"] >> gpio) & 1).astype(np.uint8)
+        plain = (flags & (NTFY_FLAGS_EVENT | NTFY_FLAGS_ALIVE | NTFY_FLAGS_WDOG)) == 0
+        watchdog = ((flags & NTFY_FLAGS_WDOG) != 0) & ((flags & NTFY_FLAGS_GPIO) == gpio)
+        plain_at = np.flatnonzero(plain)
+        plain_bits = bits[plain_at]
+        previous = np.empty_like(plain_bits)
+        if len(plain_bits):
+            previous[0] = last_level
+            previous[1:] = plain_bits[:-1]
+            last_level = int(plain_bits[-1])
+        edges_at = plain_at[plain_bits != previous]
+        order = np.sort(np.concatenate((edges_at, np.flatnonzero(watchdog))))
+        levels = bits[order]
+        levels[watchdog[order]] = TIMEOUT
+        return reports["tick"][order], levels, last_level
+    ticks, levels = [], []
+    for seqno, flags, tick, level in REPORT.iter_unpack(data):
+        if flags & NTFY_FLAGS_WDOG:
+            if flags & NTFY_FLAGS_GPIO == gpio:
+                ticks.append(tick)
+                levels.append(TIMEOUT)
+        elif not flags & (NTFY_FLAGS_EVENT | NTFY_FLAGS_ALIVE):
+            bit = (level >> gpio) & 1
+            if bit != last_level:
+                ticks.append(tick)
+                levels.append(bit)
+                last_level = bit
+    return ticks, levels, last_level
+
+
+def count_lost(data, last_seqno):
+    """Reports pigpiod dropped between consecutive seqnos (it wraps at 16 bits)."""
+    if np is not None:
+        seqnos = np.frombuffer(data, REPORT_DTYPE)["seqno"].astype(np.int64)
+    else:
+        seqnos = [record[0] for record in REPORT.iter_unpack(data)]
+    if not len(seqnos):
+        return 0, last_seqno
+    lost = 0
+    if last_seqno is not None:
+        lost += (int(seqnos[0]) - last_seqno - 1) & 0xFFFF
+    if np is not None:
+        lost += int(((np.diff(seqnos) - 1) & 0xFFFF).sum())
+    else:
+        lost += sum((b - a - 1) & 0xFFFF for a, b in zip(seqnos, seqnos[1:]))
+    return lost, int(seqnos[-1])
+
+
+class NotifyStream:
+    """One pigpio notification pipe for `gpio`, shared by every consumer.
+
+    pigpiod writes a 12-byte gpioReport per level change into
+    /dev/pigpio<handle>; a reader thread takes them BLOCK_RECORDS at a time,
+    turns them into (ticks, levels) arrays with parse_reports() and hands the
+    same arrays to each consumer. Consumers take the whole block at once
+    (EdgeCollector.feed, EdgeRing.extend, or per_edge() around a pigpio
+    style callback), so there is no per-edge socket message or dispatch.
+    Watchdogs set on the gpio by anyone show up in the stream as TIMEOUTs."""
+
+    def __init__(self, gpio, block_records=BLOCK_RECORDS):
+        self.gpio = gpio
+        self.block_records = block_records
+        self.consumers = []
+        self.records = 0
+        self.edges = 0
+        self.lost = 0
+        self._pi = None
+        self._handle = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        pi = pigpio_pool.lease(f"notify{self.gpio}")
+        handle = fd = None
+        try:
+            handle = pi.notify_open()
+            if handle < 0:
+                raise RuntimeError(f"pigpio notify_open failed ({handle})")
+            fd = os.open(PIPE_PATH.format(handle), os.O_RDONLY | os.O_NONBLOCK)
+            self._last_level = pi.read(self.gpio)
+            pi.notify_begin(handle, 1 << self.gpio)
+        except Exception:
+            # أي فشل هنا: نسكّر اللي انفتح ونرجّع الـ lease
+            if fd is not None:
+                os.close(fd)
+            if handle is not None and handle >= 0:
+                try:
+                    pi.notify_close(handle)
+                except Exception:
+                    pass
+            pi.release()
+            raise
+        self._pi, self._handle, self._fd = pi, handle, fd
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"notify-{self.gpio}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        try:
+            self._pi.notify_close(self._handle)
+        finally:
+            os.close(self._fd)
+            self._pi.release()
+
+    def _run(self):
+        size = REPORT.size
+        pending = b""
+        last_seqno = None
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self._fd], [], [], POLL_INTERVAL)
+            if not ready:
+                continue
+            try:
+                data = os.read(self._fd, size * self.block_records)
+            except BlockingIOError:
+                continue
+            if not data:
+                print(f"⚠️ pigpio notification pipe for GPIO {self.gpio} closed")
+                break
+            data = pending + data
+            whole = len(data) - len(data) % size
+            data, pending = data[:whole], data[whole:]
+            lost, last_seqno = count_lost(data, last_seqno)
+            self.lost += lost
+            self.records += whole // size
+            ticks, levels, self._last_level = parse_reports(data, self.gpio, self._last_level)
+            if not len(ticks):
+                continue
+            self.edges += len(ticks)
+            for consumer in list(self.consumers):
+                try:
+                    consumer(ticks, levels)
+                except Exception as e:
+                    print(f"⚠️ Error in notify consumer: {e}")
+
+    def stats(self):
+        return {"records": self.records, "edges": self.edges, "lost": self.lost}
+
+
+def per_edge(callback, gpio):
+    """Adapt a pigpio style callback(gpio, level, tick) to take whole blocks."""
+    def feed(ticks, levels):
+        if np is not None:
+            ticks, levels = ticks.tolist(), levels.tolist()
+        for tick, level in zip(ticks, levels):
+            callback(gpio, level, tick)
+    return feed
+
+
+_streams = {}
+_lock = threading.Lock()
+
+
+def subscribe(gpio, consumer):
+    """Add `consumer(ticks, levels)` to the shared stream for `gpio`, opening it if needed."""
+    with _lock:
+        stream = _streams.get(gpio)
+        if stream is None:
+            stream = _streams[gpio] = NotifyStream(gpio).start()
+        stream.consumers.append(consumer)
+        return stream
+
+
+def unsubscribe(gpio, consumer):
+    """Remove `consumer`; the pipe is closed when its last consumer leaves."""
+    with _lock:
+        stream = _streams.get(gpio)
+        if stream is None or consumer not in stream.consumers:
+            return
+        stream.consumers.remove(consumer)
+        if not stream.consumers:
+            del _streams[gpio]
+            stream.stop()
@@ -0,0 +1,151 @@
+import queue
+import threading
+from array import array
+
+DEFAULT_QUEUE_SIZE = 64
+# edges per frame slot; the longest real frame (128 bit) is ~260 edges
+SLOT_SIZE = 512
+
+
+class EdgeBuffer:
+    """Preallocated uint16 edge store split into fixed-size frame slots.
+
+    The pigpio callback appends durations to the current slot and hands the
+    finished frame on as a zero-copy memoryview; the reader calls release()
+    once per frame, in the order frames were committed. `committed` is only
+    written by the callback thread and `released` only by the reader, so no
+    lock is needed."""
+
+    def __init__(self, slots, slot_size=SLOT_SIZE):
+        self.slots = slots
+        self.slot_size = slot_size
+        self._buf = array("H", bytes(2 * slots * slot_size))
+        self._view = memoryview(self._buf)
+        self.committed = 0
+        self.released = 0
+        self.start = 0
+        self.length = 0
+        self.overflowed = False
+
+    def append(self, duration):
+        if self.length == self.slot_size:
+            self.overflowed = True
+            return False
+        self._buf[self.start + self.length] = duration
+        self.length += 1
+        return True
+
+    def extend(self, durations):
+        # `durations` is a uint16 buffer (numpy array or array("H"))
+        count = len(durations)
+        free = self.slot_size - self.length
+        if count > free:
+            self.overflowed = True
+            count = free
+        if count:
+            at = self.start + self.length
+            self._view[at:at + count] = durations[:count]
+            self.length += count
+        return not self.overflowed
+
+    def frame(self):
+        return self._view[self.start:self.start + self.length]
+
+    def has_free_slot(self):
+        # the slot after the current one must not still be held by the reader
+        return self.committed + 1 - self.released < self.slots
+
+    def commit(self):
+        self.committed += 1
+        self.start = (self.committed % self.slots) * self.slot_size
+        self.length = 0
+        self.overflowed = False
+
+    def discard(self):
+        self.length = 0
+        self.overflowed = False
+
+    def release(self):
+        self.released += 1
+
+
+class DecodePipeline:
+    """Bounded hand-off between the pigpio callback thread and a decode worker.
+
+    The callback fills `buffer` and only calls submit(); frames that arrive
+    while the queue is full are dropped and counted instead of blocking edge
+    handling. The buffer has two slots more than the queue (one being decoded,
+    one being filled), so an accepted frame always has a slot to commit into."""
+
+    def __init__(self, decoder, maxsize=DEFAULT_QUEUE_SIZE):
+        self.decoder = decoder
+        self.frames = queue.Queue(maxsize=maxsize)
+        self.buffer = EdgeBuffer(maxsize + 2)
+        # each counter has a single writer: submit() or the worker thread
+        self.enqueued = 0
+        self.decoded = 0
+        self.dropped = 0
+        self._thread = None
+
+    def submit(self, frame):
+        # `frame` is a view into self.buffer; it stays valid until released
+        if not self.buffer.has_free_slot():
+            self.dropped += 1
+            return False
+        try:
+            self.frames.put_nowait(frame)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def drain(self):
+        # decode everything queued on the calling thread (no worker running)
+        while True:
+            try:
+                frame = self.frames.get_nowait()
+            except queue.Empty:
+                return
+            if frame is not None:
+                self._decode(frame)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="rf-decode", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=2):
+        if self._thread is None:
+            return
+        try:
+            self.frames.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self):
+        return {
+            "enqueued": self.enqueued,
+            "decoded": self.decoded,
+            "dropped": self.dropped,
+            "pending": self.frames.qsize(),
+        }
+
+    def _run(self):
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                break
+            self._decode(frame)
+
+    def _decode(self, frame):
+        try:
+            self.decoder.process_timings(frame)
+        except Exception as e:
+            print(f"⚠️ Error decoding frame: {e}")
+        finally:
+            self.buffer.release()
+        self.decoded += 1
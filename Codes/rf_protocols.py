@@ -0,0 +1,227 @@
+import time
+from rf_decoder import TIMEOUT, MIN_EDGE_US, REPEAT_SUPPRESSION_MS, tick_diff
+
+# حالات الـ state machine نفسها اللي في Lip/recSAM.c
+RADIO_LISTEN = 0
+RADIO_SYNC_OK = 1
+
+# نافذة الـ pulse length زي f1 في recSAM.c (400 ± 100) بس أوسع حتى تغطي ريموتات rc-switch
+PULSE_RANGE = (150, 700)
+TOLERANCE = 0.45
+PREAMBLE_ERR = 100
+
+
+def flip32(data):
+    # نفس flip32 في recSAM.c: يعكس ترتيب الـ 32 bit
+    return int(format(data & 0xFFFFFFFF, "032b")[::-1], 2)
+
+
+def keeloq_fields(value):
+    """Split a 66-bit KeeLoq (HCS301) frame like recSAM.c's dataE/dataF/dataVR.
+
+    Bits arrive LSB first: 32 encrypted bits, 28-bit serial + 4 button bits,
+    then the battery-low and repeat flags."""
+    encrypted = flip32(value >> 34)
+    fixed = flip32(value >> 2)
+    return {
+        "encrypted": encrypted,
+        "serial": fixed & 0x0FFFFFFF,
+        "buttons": fixed >> 28,
+        "vlow": (value >> 1) & 1,
+        "repeat": value & 1,
+    }
+
+
+def ev1527_fields(value):
+    return {"id": value >> 4, "key": value & 0xF}
+
+
+def pt2262_fields(value):
+    # كل رمزين bit: 00 = 0, 11 = 1, 01 = F (floating)؛ 10 مو رمز صالح
+    symbols = {0b00: "0", 0b11: "1", 0b01: "F"}
+    trits = [symbols.get((value >> shift) & 0b11, "?") for shift in range(22, -1, -2)]
+    return {"trits": "".join(trits)}
+
+
+class Protocol:
+    """Timing definition of one pulse-width protocol.
+
+    `sync`, `zero` and `one` are (high, low) in units of the pulse length,
+    which is learned from each frame's sync low. A sync is only accepted
+    after `preamble` 50% duty pulses (0 = no preamble). `validate(value)`
+    can reject frames the timing alone lets through, and `fields(value)`
+    splits a frame into named parts."""
+
+    def __init__(self, name, nbits, sync, zero, one, pulse_range=PULSE_RANGE, tolerance=TOLERANCE,
+                 preamble=0, save_keys=False, validate=None, fields=None):
+        self.name = name
+        self.nbits = nbits
+        self.sync = sync
+        self.zero = zero
+        self.one = one
+        self.pulse_range = pulse_range
+        self.tolerance = tolerance
+        self.preamble = preamble
+        self.save_keys = save_keys
+        self.validate = validate
+        self.fields = fields
+
+    def __repr__(self):
+        return f"Protocol({self.name}, {self.nbits} bits)"
+
+
+PROTOCOLS = {
+    # rc-switch protocol 1؛ نفس التوقيت اللي يرسله rf_transmit
+    "ev1527": Protocol("ev1527", 24, sync=(1, 31), zero=(1, 3), one=(3, 1), save_keys=True,
+                       fields=ev1527_fields),
+    "pt2262": Protocol("pt2262", 24, sync=(1, 31), zero=(1, 3), one=(3, 1), save_keys=True,
+                       validate=lambda value: "?" not in pt2262_fields(value)["trits"], fields=pt2262_fields),
+    # HCS301: preamble من نبضات مربعة، header = 10 TE low، ثم 66 bit (1 = نبضة قصيرة)
+    "keeloq": Protocol("keeloq", 66, sync=(1, 10), zero=(2, 1), one=(1, 2), pulse_range=(300, 500),
+                       preamble=10, fields=keeloq_fields),
+}
+
+
+class ProtocolState:
+    """recSAM.c's radioRXC for one protocol: fed one (on, off) pulse at a
+    time, it hunts for the sync, then shifts in bits until the last one."""
+
+    def __init__(self, protocol):
+        self.protocol = protocol
+        self.state = RADIO_LISTEN
+        self.squares = 0
+        self.reset()
+
+    def reset(self):
+        self.index = 0
+        self.value = 0
+        self.pulse = 0
+        self.period_sum = 0
+        self.period_sq = 0
+        self.timings = []
+
+    def is_square(self, on, off):
+        low, high = self.protocol.pulse_range
+        return low <= on <= high and low <= off <= high and abs(on - off) < PREAMBLE_ERR
+
+    def check_sync(self, on, off):
+        p = self.protocol
+        if self.is_square(on, off):
+            self.squares += 1
+            return
+        # زي rc-switch: طول النبضة من الـ sync low لأنه الأطول والأدق
+        pulse = off / p.sync[1]
+        if (self.squares >= p.preamble and p.pulse_range[0] <= pulse <= p.pulse_range[1]
+                and abs(on - p.sync[0] * pulse) <= p.tolerance * pulse):
+            self.reset()
+            self.pulse = pulse
+            self.state = RADIO_SYNC_OK
+        self.squares = 0
+
+    def matches(self, duration, units):
+        return abs(duration - units * self.pulse) <= self.protocol.tolerance * self.pulse
+
+    def check_bit(self, on, off):
+        p = self.protocol
+        if self.matches(on, p.one[0]) and self.matches(off, p.one[1]):
+            bit = 1
+        elif self.matches(on, p.zero[0]) and self.matches(off, p.zero[1]):
+            bit = 0
+        else:
+            # radio_rx_get_err؛ بس النبضة نفسها ممكن تكون sync جديد
+            self.state = RADIO_LISTEN
+            self.check_sync(on, off)
+            return
+        self.value = (self.value << 1) | bit
+        self.index += 1
+        self.period_sum += on + off
+        self.period_sq += (on + off) ** 2
+        self.timings += (on, off)
+
+    def on_pulse(self, on, off):
+        if self.state == RADIO_LISTEN:
+            self.check_sync(on, off)
+        elif self.index < self.protocol.nbits - 1:
+            self.check_bit(on, off)
+
+    def on_high(self, on):
+        """Falling edge: the last bit is decided from its high alone (like
+        radio_ckeck_end_bit_pulse), so the frame is ready without waiting for
+        the gap after it. Returns the value when a frame completes."""
+        p = self.protocol
+        if self.state != RADIO_SYNC_OK or self.index != p.nbits - 1:
+            return None
+        bit = 1 if abs(on - p.one[0] * self.pulse) < abs(on - p.zero[0] * self.pulse) else 0
+        self.value = (self.value << 1) | bit
+        self.index += 1
+        self.timings.append(on)
+        self.state = RADIO_LISTEN
+        if p.validate is not None and not p.validate(self.value):
+            return None
+        return self.value
+
+    def stddev(self):
+        n = self.index - 1
+        if n < 2:
+            return 0.0
+        mean = self.period_sum / n
+        return max(self.period_sq / n - mean * mean, 0) ** 0.5
+
+
+class IncrementalDecoder:
+    """Edge-at-a-time decoder for the protocols in `protocols`.
+
+    `rf_callback` has the pigpio callback signature. Every rising edge closes
+    an (on, off) pulse that each protocol's state machine consumes, and a
+    frame is reported through `on_frame(protocol, value, nbits)` on the
+    falling edge that ends its last bit. Edges closer than MIN_EDGE_US are
+    dropped as noise, and watchdog TIMEOUTs are ignored, so a long sync low
+    (rc-switch's is 31 pulses) is not cut. Repeats of the same code are
+    suppressed as in FrameDecoder, and `last_frame` has the same
+    (pulses, mean, stddev, time) shape, with the learned pulse length as mean;
+    `last_timings` holds the frame's bit durations, high first."""
+
+    def __init__(self, protocols, on_frame, clock=time.time):
+        self.states = [ProtocolState(p) for p in protocols]
+        self.on_frame = on_frame
+        self.clock = clock
+        self.last_tick = None
+        self.on = 0
+        self.last_code = None
+        self.last_code_time = 0
+        self.last_frame = None
+        self.last_timings = None
+        self.frames = 0
+
+    def rf_callback(self, gpio, level, tick):
+        if level == TIMEOUT:
+            return
+        last_tick, self.last_tick = self.last_tick, tick
+        if last_tick is None:
+            return
+        duration = tick_diff(last_tick, tick)
+        # زي recSAM.c: الـ glitch ينرمى بس الوقت يتحسب من عنده
+        if duration <= MIN_EDGE_US:
+            return
+        if level:
+            for state in self.states:
+                state.on_pulse(self.on, duration)
+        else:
+            self.on = duration
+            for state in self.states:
+                value = state.on_high(duration)
+                if value is not None:
+                    self.report(state, value)
+
+    def report(self, state, value):
+        protocol = state.protocol
+        code = (protocol.name, value)
+        now_time = self.clock()
+        if code == self.last_code and (now_time - self.last_code_time) * 1000 <= REPEAT_SUPPRESSION_MS:
+            return
+        self.last_code = code
+        self.last_code_time = now_time
+        self.frames += 1
+        self.last_frame = (protocol.nbits * 2, state.pulse, state.stddev(), now_time)
+        self.last_timings = state.timings
+        self.on_frame(protocol, value, protocol.nbits)
@@ -0,0 +1,280 @@
+import sys
+import time
+import pigpio_pool
+from rf_decoder import PROFILES, TIMEOUT, FrameDecoder, EdgeCollector
+from rf_pipeline import DecodePipeline
+from jamming_detector import JammingAnalyzer
+
+TICK_MASK = 0xFFFFFFFF
+GPIO_RX = 21
+WATCHDOG_MS = 10
+GAP_US = 20000
+REALTIME_SLICE_US = 5000
+
+
+class SimulatedCallback:
+    def __init__(self, pi, gpio, edge, func):
+        self.pi = pi
+        self.gpio = gpio
+        self.edge = edge
+        self.func = func
+
+    def cancel(self):
+        if self in self.pi.callbacks:
+            self.pi.callbacks.remove(self)
+
+
+class SimulatedPi:
+    """Stand-in for pigpio.pi that is driven by play() instead of a radio.
+
+    It supports what the receivers, the detector and the jammer call, so a
+    worker can run against it through PigpioManager(factory=...). play()
+    delivers (tick, level) events to the registered callbacks, adding the
+    watchdog TIMEOUTs pigpio would send, as fast as possible or in real time.
+    `elapsed_us` is the simulated time, unwrapped."""
+
+    connected = True
+
+    def __init__(self, start_tick=0):
+        self.tick = start_tick
+        self.elapsed_us = 0
+        self.edges = 0
+        self.callbacks = []
+        self.modes = {}
+        self.levels = {}
+        self.watchdogs = {}
+
+    def callback(self, gpio, edge=pigpio_pool.RISING_EDGE, func=None):
+        cb = SimulatedCallback(self, gpio, edge, func)
+        self.callbacks.append(cb)
+        return cb
+
+    def set_watchdog(self, gpio, timeout):
+        if timeout:
+            self.watchdogs[gpio] = timeout
+        else:
+            self.watchdogs.pop(gpio, None)
+        return 0
+
+    def set_mode(self, gpio, mode):
+        self.modes[gpio] = mode
+        return 0
+
+    def set_pull_up_down(self, gpio, pud):
+        return 0
+
+    def read(self, gpio):
+        return self.levels.get(gpio, 0)
+
+    def write(self, gpio, level):
+        self.levels[gpio] = level
+        return 0
+
+    def get_current_tick(self):
+        return self.tick
+
+    def stop(self):
+        self.connected = False
+
+    # الإرسال ما له أثر في المحاكاة
+    def wave_add_new(self):
+        return 0
+
+    def wave_add_generic(self, pulses):
+        return len(pulses)
+
+    def wave_create(self):
+        return 0
+
+    def wave_send_once(self, wave_id):
+        return 0
+
+    def wave_send_repeat(self, wave_id):
+        return 0
+
+    def wave_tx_busy(self):
+        return 0
+
+    def wave_tx_stop(self):
+        return 0
+
+    def wave_delete(self, wave_id):
+        return 0
+
+    def wave_clear(self):
+        return 0
+
+    def play(self, events, gpio=GPIO_RX, realtime=False):
+        """Deliver `events` to the callbacks on `gpio`; returns the edge count."""
+        for tick, level in with_watchdog(events, self.watchdogs.get(gpio)):
+            delta = (tick - self.tick) & TICK_MASK
+            if realtime:
+                # الـ tick يمشي أثناء الانتظار عشان get_current_tick() يشوف الوقت يمر
+                while delta > REALTIME_SLICE_US:
+                    time.sleep(REALTIME_SLICE_US / 1e6)
+                    self.tick = (self.tick + REALTIME_SLICE_US) & TICK_MASK
+                    self.elapsed_us += REALTIME_SLICE_US
+                    delta -= REALTIME_SLICE_US
+                if delta:
+                    time.sleep(delta / 1e6)
+            self.tick = tick
+            self.elapsed_us += delta
+            if level == TIMEOUT:
+                matches = lambda cb: True
+            else:
+                self.edges += 1
+                self.levels[gpio] = level
+                matches = lambda cb: cb.edge == pigpio_pool.EITHER_EDGE or cb.edge == 1 - level
+            for cb in list(self.callbacks):
+                if cb.gpio == gpio and matches(cb):
+                    cb.func(gpio, level, tick)
+        return self.edges
+
+
+def with_watchdog(events, watchdog_ms):
+    """Insert the TIMEOUT pigpio sends after `watchdog_ms` without an edge.
+
+    Recorded traces already contain their TIMEOUTs; those are passed through
+    and no second one is made for the same gap."""
+    if not watchdog_ms:
+        yield from events
+        return
+    span = watchdog_ms * 1000
+    last = None
+    for tick, level in events:
+        if level == TIMEOUT:
+            last = None
+            yield tick, level
+            continue
+        if last is not None and (tick - last) & TICK_MASK > span:
+            yield (last + span) & TICK_MASK, TIMEOUT
+        last = tick
+        yield tick, level
+    if last is not None:
+        yield (last + span) & TICK_MASK, TIMEOUT
+
+
+def frames_to_events(frames, gap_us=GAP_US, start_tick=0):
+    """Turn frames of alternating high/low durations (µs, high first) into
+    (tick, level) edges, with `gap_us` of low after each frame."""
+    tick = start_tick
+    for durations in frames:
+        level = 1
+        yield tick & TICK_MASK, level
+        for duration in durations[:-1]:
+            tick += duration
+            level ^= 1
+            yield tick & TICK_MASK, level
+        if level == 1:
+            tick += durations[-1]
+            yield tick & TICK_MASK, 0
+            tick += gap_us
+        else:
+            tick += durations[-1] + gap_us
+
+
+def trace_events(path):
+    """Stream (tick, level) from a trace_file recording without loading it."""
+    from trace_file import TraceReader
+    reader = TraceReader(path)
+    try:
+        yield from reader.events()
+    finally:
+        reader.close()
+
+
+class ReplayResult:
+    def __init__(self, frames, stats, edges, elapsed, simulated):
+        self.frames = frames
+        self.stats = stats
+        self.edges = edges
+        self.elapsed = elapsed
+        self.simulated = simulated
+
+    def throughput(self):
+        """Edges decoded per wall-clock second."""
+        return self.edges / self.elapsed if self.elapsed else 0.0
+
+    def speedup(self):
+        """How many times faster than real time the replay ran."""
+        return self.simulated / self.elapsed if self.elapsed else 0.0
+
+    def codes(self):
+        return [(value, nbits) for value, nbits, profile, seconds in self.frames]
+
+
+def replay_decode(events, profiles=None, watchdog_ms=WATCHDOG_MS, gpio=GPIO_RX):
+    """Run events through the real EdgeCollector -> DecodePipeline ->
+    FrameDecoder chain on a SimulatedPi, faster than real time.
+
+    The pipeline is drained on every TIMEOUT instead of by its worker thread,
+    and repeat suppression uses simulated time, so results are deterministic.
+    Each frame is (value, nbits, profile name, simulated seconds)."""
+    pi = SimulatedPi()
+    frames = []
+    clock = lambda: pi.elapsed_us / 1e6
+
+    def on_frame(profile, value, nbits):
+        frames.append((value, nbits, profile.name, clock()))
+
+    decoder = FrameDecoder(profiles or list(PROFILES.values()), on_frame, clock=clock)
+    pipeline = DecodePipeline(decoder)
+    collector = EdgeCollector(pipeline, decoder.min_pulses)
+
+    def rf_callback(gpio, level, tick):
+        collector.rf_callback(gpio, level, tick)
+        if level == TIMEOUT:
+            pipeline.drain()
+
+    pi.set_watchdog(gpio, watchdog_ms)
+    pi.callback(gpio, pigpio_pool.EITHER_EDGE, rf_callback)
+    start = time.perf_counter()
+    pi.play(events, gpio)
+    pipeline.drain()
+    elapsed = time.perf_counter() - start
+    return ReplayResult(frames, pipeline.stats(), pi.edges, elapsed, pi.elapsed_us / 1e6)
+
+
+def replay_jamming(events, step_ms=25, **analyzer_args):
+    """Run events through a JammingAnalyzer, updating it every `step_ms` of
+    simulated time like the detector does. Returns (seconds, jammed, percent)."""
+    analyzer = JammingAnalyzer(**analyzer_args)
+    step = step_ms * 1000
+    results = []
+    ticks, levels = [], []
+    elapsed = 0
+    next_update = step
+    last = None
+    for tick, level in events:
+        if last is not None:
+            elapsed += (tick - last) & TICK_MASK
+        last = tick
+        while elapsed >= next_update:
+            analyzer.feed(ticks, levels)
+            ticks, levels = [], []
+            analyzer.update((tick - (elapsed - next_update)) & TICK_MASK)
+            results.append((next_update / 1e6, analyzer.jammed, analyzer.percent()))
+            next_update += step
+        if level != TIMEOUT:
+            ticks.append(tick)
+            levels.append(level)
+    return results
+
+
+def use_simulator(pi=None):
+    """Point pigpio_pool at a SimulatedPi so workers run without hardware."""
+    pi = pi or SimulatedPi()
+    pigpio_pool.manager = pigpio_pool.PigpioManager(factory=lambda: pi)
+    return pi
+
+
+if __name__ == "__main__":
+    # الاستخدام: python3 rf_sim.py TRACE.rft [24] [32] [64] [128]
+    if len(sys.argv) < 2:
+        exit("❌ Usage: python3 rf_sim.py TRACE [24 32 64 128]")
+    names = sys.argv[2:] or list(PROFILES)
+    result = replay_decode(trace_events(sys.argv[1]), [PROFILES[name] for name in names])
+    for value, nbits, profile, seconds in result.frames:
+        print(f"{seconds:10.3f}s  {nbits:3d} bit  {value}")
+    print(f"📊 {len(result.frames)} frames from {result.edges} edges, {result.simulated:.1f}s of signal "
+          f"in {result.elapsed:.2f}s ({result.speedup():.0f}x real time, {result.throughput():.0f} edges/s)")
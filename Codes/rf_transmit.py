@@ -0,0 +1,41 @@
+import time
+import pigpio_pool
+
+GPIO_TX = 20
+# rc-switch protocol 1 (نفس الافتراضي في rpi_rf): طول النبضة µs ثم (high, low) بالمضاعفات
+PULSE_LENGTH = 350
+SYNC = (1, 31)
+ZERO = (1, 3)
+ONE = (3, 1)
+REPEAT = 10
+
+
+def code_length(code):
+    # نفس قاعدة rpi_rf لما ما نحدد الطول
+    return 32 if code > 16777216 else 24
+
+
+def code_pulses(code, gpio=GPIO_TX, length=None, repeat=REPEAT, pulse_length=PULSE_LENGTH):
+    mask = 1 << gpio
+    bits = format(code, f"0{length or code_length(code)}b")
+    frame = []
+    for symbol in [ONE if bit == "1" else ZERO for bit in bits] + [SYNC]:
+        frame.append(pigpio_pool.pulse(mask, 0, symbol[0] * pulse_length))
+        frame.append(pigpio_pool.pulse(0, mask, symbol[1] * pulse_length))
+    return frame * repeat
+
+
+def send_code(pi, code, gpio=GPIO_TX, length=None, repeat=REPEAT):
+    """Transmit `code` as one pigpio wave, so the timing does not depend on
+    Python sleeps. `pi` can be a pigpio_pool lease."""
+    pi.set_mode(gpio, pigpio_pool.OUTPUT)
+    pi.wave_add_new()
+    pi.wave_add_generic(code_pulses(code, gpio, length, repeat))
+    wave_id = pi.wave_create()
+    try:
+        pi.wave_send_once(wave_id)
+        while pi.wave_tx_busy():
+            time.sleep(0.01)
+    finally:
+        pi.wave_delete(wave_id)
+        pi.write(gpio, 0)
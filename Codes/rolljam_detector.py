@@ -0,0 +1,223 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+import pigpio_pool
+import rf_notify
+from jamming_detector import EdgeRing, JammingAnalyzer, NoiseBaseline, WINDOWS_MS, BASELINE_PATH
+from rf_decoder import PROFILES, FrameDecoder, EdgeCollector
+from rf_messages import CodeFrame, JammingLevel, RollJamAlert, Status, Stopped
+from rf_pipeline import DecodePipeline
+from replay_detector import BURST_S, code_key
+
+GPIO_RX = 21
+# الإطار اللي ينفك خلال ثانية من نهاية التشويش يعتبر "انمسك تحت التشويش"
+JAM_GUARD_S = 1.0
+# "تشويش" يبدأ وينتهي مع إطارات تنفك (خلال كذا) هو إرسال الريموت نفسه، مو jammer
+TRAIN_SLACK_S = 0.25
+# كم نستنى الـ replay؛ RollJam يقدر يحتفظ بالكود أيام، بس الذاكرة محدودة بـ MAX_SUSPECTS
+REPLAY_WINDOW_S = 24 * 3600
+MAX_BURSTS = 64
+MAX_SUSPECTS = 256
+
+
+class RollJamCorrelator:
+    """Matches jam burst -> frame -> delayed replay of the same code.
+
+    Jamming bursts (start, end) are kept in a short time-ordered deque; a
+    frame decoded during a burst, or within `guard_s` of its end, becomes a
+    suspect: a code the real receiver most likely never got. If that code
+    shows up again later than a natural repeat (`burst_s`) and within
+    `replay_window_s`, it is a replay of a captured code and an alert is
+    returned, whether it comes in the clear or under a later burst (the
+    classic attack replays code A while jamming to capture code B). A burst
+    that starts and ends with frames decoding all through it, within
+    `train_slack_s`, was the remote's own repeat train and not jamming: it
+    is dropped with the suspects it made. Both structures are capped (MAX_BURSTS, MAX_SUSPECTS), so memory stays
+    bounded however long it runs; every call is O(1) amortized."""
+
+    def __init__(self, guard_s=JAM_GUARD_S, burst_s=BURST_S, replay_window_s=REPLAY_WINDOW_S,
+                 max_suspects=MAX_SUSPECTS, train_slack_s=TRAIN_SLACK_S):
+        self.guard_s = guard_s
+        self.burst_s = burst_s
+        self.replay_window_s = replay_window_s
+        self.max_suspects = max_suspects
+        self.train_slack_s = train_slack_s
+        self.bursts = deque(maxlen=MAX_BURSTS)
+        self.jam_start = None
+        # [أول, آخر] إطار انفك خلال الـ burst الحالي
+        self.train = None
+        self.suspects = OrderedDict()
+        self.alerts = 0
+
+    def on_jamming(self, jammed, now):
+        if jammed and self.jam_start is None:
+            self.jam_start = now
+            self.train = None
+        elif not jammed and self.jam_start is not None:
+            if self.is_train(self.jam_start, now):
+                self.drop_suspects(self.jam_start)
+            else:
+                self.bursts.append((self.jam_start, now))
+            self.jam_start = None
+            self.train = None
+
+    def is_train(self, start, end):
+        # jammer حقيقي يبدأ قبل ضغطة الضحية ويكمل بعدها؛ الريموت "يشوش" بس وقت ما يرسل
+        train = self.train
+        slack = self.train_slack_s
+        return train is not None and start >= train[0] - slack and end <= train[1] + slack
+
+    def drop_suspects(self, jam_start):
+        for key in [key for key, suspect in self.suspects.items() if suspect[0] == jam_start]:
+            del self.suspects[key]
+
+    def jam_around(self, now):
+        """The burst covering `now` (allowing for the guard), or None."""
+        if self.jam_start is not None and now >= self.jam_start - self.guard_s:
+            return self.jam_start, None
+        while self.bursts and now - self.bursts[0][1] > self.guard_s:
+            # الإطارات توصل بالترتيب، فالـ burst اللي خلص قبل الـ guard ما عاد له فايدة
+            self.bursts.popleft()
+        for start, end in reversed(self.bursts):
+            if start - self.guard_s <= now <= end + self.guard_s:
+                return start, end
+        return None
+
+    def on_frame(self, key, now):
+        """Feed a decoded frame; returns an alert dict when it completes the pattern."""
+        self.expire(now)
+        if self.jam_start is not None and now >= self.jam_start:
+            if self.train is None:
+                self.train = [now, now]
+            self.train[1] = now
+        burst = self.jam_around(now)
+        suspect = self.suspects.get(key)
+        if suspect is not None:
+            jam_start, captured, last_seen = suspect
+            if now - last_seen <= self.burst_s:
+                # نفس الضغطة لسه تتكرر
+                suspect[2] = now
+                return None
+            if burst is None or burst[0] != jam_start:
+                del self.suspects[key]
+                self.alerts += 1
+                return {"key": key, "jam_start": jam_start, "captured": captured, "replayed": now,
+                        "delay": now - captured}
+        if burst is not None:
+            self.suspects[key] = [burst[0], now, now]
+            self.suspects.move_to_end(key)
+            if len(self.suspects) > self.max_suspects:
+                self.suspects.popitem(last=False)
+        return None
+
+    def expire(self, now):
+        while self.suspects:
+            key, (jam_start, captured, last_seen) = next(iter(self.suspects.items()))
+            if now - captured <= self.replay_window_s:
+                break
+            del self.suspects[key]
+
+
+class RollJamDetector:
+    """Jamming detection and decoding on one edge stream, correlated.
+
+    A single pigpio callback (or the shared rf_notify stream) feeds both the
+    EdgeRing of a JammingAnalyzer and the EdgeCollector of a FrameDecoder,
+    so the two no longer have to run as separate, exclusive modes. Status
+    changes of the analyzer and decoded frames go into a RollJamCorrelator;
+    JammingLevel is emitted on status changes, CodeFrame for every frame,
+    a Status when a frame was caught under jamming and a RollJamAlert when
+    such a code is replayed."""
+
+    def __init__(self, names=None, gpio=GPIO_RX, windows_ms=WINDOWS_MS, baseline_path=BASELINE_PATH,
+                 notify=False, correlator=None):
+        self.names = list(names or PROFILES)
+        self.gpio = gpio
+        self.notify = notify
+        self.ring = EdgeRing()
+        self.step = min(windows_ms) / 2000
+        self.baseline_path = baseline_path
+        baseline = NoiseBaseline(self.step) if baseline_path else None
+        self.analyzer = JammingAnalyzer(windows_ms, baseline=baseline)
+        self.correlator = correlator or RollJamCorrelator()
+
+    def run(self, stop, emit):
+        correlator = self.correlator
+        # الإطارات من thread الـ pipeline وحالة التشويش من هذا الـ loop
+        lock = threading.Lock()
+
+        def on_frame(profile, value, nbits):
+            pulses, mean, stddev, frame_time = decoder.last_frame
+            emit(CodeFrame(f"{value}", nbits, profile.name, pulses, round(float(stddev), 1), time=frame_time))
+            key = code_key(profile.name, value)
+            with lock:
+                was_suspect = key in correlator.suspects
+                alert = correlator.on_frame(key, frame_time)
+                is_suspect = key in correlator.suspects
+            if alert is not None:
+                emit(RollJamAlert(f"{value}", profile.name, alert["jam_start"], alert["captured"],
+                                  alert["replayed"], round(alert["delay"], 1), time=frame_time))
+            elif is_suspect and not was_suspect:
+                emit(Status(f"⚠️ {value} caught under jamming"))
+
+        def on_edge(gpio, level, tick):
+            ring.rf_callback(gpio, level, tick)
+            collector.rf_callback(gpio, level, tick)
+
+        ring = self.ring
+        analyzer = self.analyzer
+        baseline = analyzer.baseline
+        if baseline is not None:
+            baseline.load(self.baseline_path)
+        decoder = FrameDecoder([PROFILES[name] for name in self.names], on_frame)
+        pipeline = collector = None
+        pi = pigpio_pool.lease("rolljam_detect")
+        try:
+            pi.set_mode(self.gpio, pigpio_pool.INPUT)
+            pi.set_pull_up_down(self.gpio, pigpio_pool.PUD_DOWN)
+            pipeline = DecodePipeline(decoder).start()
+            collector = EdgeCollector(pipeline, decoder.min_pulses)
+            if self.notify:
+                rf_notify.subscribe(self.gpio, ring.extend)
+                rf_notify.subscribe(self.gpio, collector.feed)
+            else:
+                pi.callback(self.gpio, pigpio_pool.EITHER_EDGE, on_edge)
+            pi.set_watchdog(self.gpio, 10)
+            position = ring.written
+            emit(Status(f"🛡️ Watching for RollJam on {'/'.join(self.names)} bit..."))
+            while not stop.wait(self.step):
+                position, ticks, levels = ring.read(position)
+                analyzer.feed(ticks, levels)
+                was_jammed = analyzer.jammed
+                analyzer.update(pi.get_current_tick())
+                if analyzer.jammed != was_jammed:
+                    with lock:
+                        correlator.on_jamming(analyzer.jammed, time.time())
+                    emit(JammingLevel(analyzer.percent(), analyzer.status(), len(analyzer.windows[-1].edges),
+                                      analyzer.snapshot(), round(analyzer.threshold()),
+                                      round(baseline.z, 2) if baseline else None))
+        finally:
+            if self.notify:
+                rf_notify.unsubscribe(self.gpio, ring.extend)
+                if collector is not None:
+                    rf_notify.unsubscribe(self.gpio, collector.feed)
+            pi.release()
+            if pipeline is not None:
+                pipeline.stop()
+            emit(Stopped(f"🛑 RollJam watch stopped. Alerts: {correlator.alerts}, "
+                         f"suspect codes: {len(correlator.suspects)}"))
+
+
+if __name__ == "__main__":
+    import sys
+    from supervisor import run_cli
+
+    # الاستخدام: python3 rolljam_detector.py [--ndjson] [--notify] [24] [32] [64] [128]
+    args = sys.argv[1:]
+    names = [arg for arg in args if not arg.startswith("--")] or list(PROFILES)
+    unknown = [name for name in names if name not in PROFILES]
+    if unknown:
+        exit(f"❌ Unknown bit length: {', '.join(unknown)} (use {', '.join(PROFILES)})")
+    run_cli(RollJamDetector(names, notify="--notify" in args), ndjson="--ndjson" in args)
+    pigpio_pool.manager.close()
@@ -0,0 +1,331 @@
+from theme import WHITE, BLACK, GRAY, LIGHT_BLUE, RED, GREEN, ITEM_ICON
+
+# أحداث التنقل اللي يرسلها الجويستيك
+UP = "up"
+DOWN = "down"
+PRESS = "press"
+
+# هيكلية القوائم
+main_menu = ["Info", "Security part", "Attack part", "Wifi Test", "Poweroff"]
+security_menu = ["Jamming Detection", "Captcher My RF kye", "Captcher My RF kye Rolling", "Reuse My RF kye", "Exit"]
+attack_menu = ["Jamming", "Captcher RF kye", "Captcher RF kye Rolling", "Reuse My RF kye", "Exit"]
+capture_menu = ["24BIT", "32BIT", "64BIT", "128BIT", "Exit"]
+key_action_menu = ["Send", "Delete", "Exit"]
+info_lines = ["Graduation Project", "Cybersecurity", "Requirement", "By: Sami Saad", "Ahmed Rashid", "Exit"]
+CAPTURE_BITS = ["24", "32", "64", "128"]
+REUSE_PAGE = "Reuse My RF kye"
+
+
+class UIState:
+    """Which screen is shown and what is selected on it; no hardware here."""
+
+    def __init__(self):
+        self.screen = "main"
+        self.selected_index = 0
+        self.current_page = None
+        self.previous_menu = None
+        self.selected_key = None
+
+    def go(self, screen, index=0, page=None):
+        self.screen = screen
+        self.selected_index = index
+        self.current_page = page
+
+
+class Screen:
+    """One entry of the SCREENS table.
+
+    Screens get the `app` object from main.py, which carries `ui` (UIState),
+    `theme`, `key_cache`, the worker flags and the start/stop actions, so a
+    fake app is enough to drive them without any hardware."""
+
+    def item_count(self, app):
+        return 1
+
+    def on_press(self, app):
+        pass
+
+    def draw(self, app, draw):
+        pass
+
+
+class MenuScreen(Screen):
+    def __init__(self, items, actions):
+        self.items = items
+        self.actions = actions
+
+    def item_count(self, app):
+        return len(self.items)
+
+    def on_press(self, app):
+        self.actions[app.ui.selected_index](app)
+
+    def draw(self, app, draw):
+        app.theme.menu(draw, self.items, app.ui.selected_index)
+
+
+def open_menu(name, index=0):
+    def action(app):
+        if name in ("security", "attack"):
+            app.ui.previous_menu = name
+        app.ui.go(name, index)
+    return action
+
+
+def open_page(screen, page):
+    def action(app):
+        app.ui.go(screen, page=page)
+    return action
+
+
+def open_capture(app):
+    app.ui.previous_menu = app.ui.screen
+    app.clear_outputs()
+    app.ui.go("capture")
+
+
+def open_jamming_detection(app):
+    app.ui.go("jamming_detection", page=security_menu[0])
+    if app.jamming_detect_active:
+        app.stop_jamming_detection()
+    else:
+        app.stop_all_processes()
+        app.start_jamming_detection()
+
+
+def poweroff(app):
+    app.poweroff()
+
+
+class InfoScreen(Screen):
+    def on_press(self, app):
+        app.ui.go("main", 0)
+
+    def draw(self, app, draw):
+        theme = app.theme
+        theme.header(draw, "Project Info")
+        for i, line in enumerate(info_lines):
+            y = 25 + i * 18
+            if i == len(info_lines) - 1 and app.ui.selected_index == 0:
+                theme.widget(draw, (5, y, 122, y + 16), line, theme.small_font, LIGHT_BLUE, BLACK, 5, (10, 2), ITEM_ICON)
+            else:
+                theme.widget(draw, (10, y, 127, y + 16), line, theme.small_font, None, WHITE, text_xy=(0, 2))
+
+
+class JammingDetectionScreen(Screen):
+    def on_press(self, app):
+        if app.jamming_detect_active:
+            app.stop_jamming_detection()
+        app.ui.go(app.ui.previous_menu, 0)
+
+    def draw(self, app, draw):
+        theme = app.theme
+        theme.header(draw, app.ui.current_page)
+        if app.jamming_detect_active:
+            theme.output_rows(draw, [message.label() for message in app.recent_outputs], 30)
+            theme.button(draw, (5, 100, 60, 116), "Stop", RED, app.ui.selected_index == 0)
+        else:
+            theme.button(draw, (5, 80, 60, 96), "Start", GREEN, app.ui.selected_index == 0)
+            theme.button(draw, (65, 80, 122, 96), "Exit", RED, app.ui.selected_index == 0)
+
+
+class PlaceholderScreen(Screen):
+    # صفحات Rolling ما لها وظيفة بعد: Test / Exit فقط
+    def on_press(self, app):
+        app.ui.go(app.ui.previous_menu, 0)
+
+    def draw(self, app, draw):
+        theme = app.theme
+        theme.header(draw, app.ui.current_page)
+        theme.button(draw, (5, 80, 60, 96), "Test", GREEN, app.ui.selected_index == 0)
+        theme.button(draw, (65, 80, 122, 96), "Exit", RED, app.ui.selected_index == 0)
+
+
+class ReuseKeysScreen(Screen):
+    def item_count(self, app):
+        saved_keys = app.key_cache.keys
+        return len(saved_keys) + 2 if saved_keys else 1
+
+    def on_press(self, app):
+        ui = app.ui
+        saved_keys = app.key_cache.keys
+        if ui.selected_index < len(saved_keys):
+            ui.selected_key = saved_keys[ui.selected_index]
+            ui.go("key_action")
+        elif ui.selected_index == len(saved_keys) + 1 or not saved_keys:
+            ui.go(ui.previous_menu, 3)
+
+    def draw(self, app, draw):
+        theme = app.theme
+        selected = app.ui.selected_index
+        saved_keys = app.key_cache.keys
+        theme.header(draw, REUSE_PAGE)
+        if not saved_keys:
+            theme.widget(draw, (10, 40, 127, 56), "No keys saved", theme.small_font, None, WHITE, text_xy=(0, 0))
+            theme.button(draw, (5, 100, 60, 116), "Exit", RED, selected == 0)
+            return
+        theme.key_rows(draw, saved_keys, selected)
+        select_y = 90 + len(saved_keys) * 15
+        theme.button(draw, (5, select_y, 60, select_y + 14), "Select", LIGHT_BLUE, selected == len(saved_keys))
+        theme.button(draw, (65, select_y, 122, select_y + 14), "Exit", RED, selected == len(saved_keys) + 1)
+
+
+class KeyActionScreen(Screen):
+    def item_count(self, app):
+        return len(key_action_menu)
+
+    def on_press(self, app):
+        ui = app.ui
+        if ui.selected_index == 0:  # Send
+            if ui.selected_key:
+                app.send_key(ui.selected_key[1])
+            ui.go("reuse_keys", page=REUSE_PAGE)
+        elif ui.selected_index == 1:  # Delete
+            if ui.selected_key:
+                app.delete_key(ui.selected_key[0])
+            ui.go("reuse_keys", page=REUSE_PAGE)
+        elif ui.selected_index == 2:  # Exit
+            ui.go(ui.previous_menu, 3)
+
+    def draw(self, app, draw):
+        theme = app.theme
+        kar_name, key_val = app.ui.selected_key
+        theme.header(draw, "Key Actions")
+        draw.rounded_rectangle((5, 30, 122, 60), radius=5, fill=GRAY)
+        draw.text((10, 32), f"Key: {kar_name}", font=theme.small_font, fill=WHITE)
+        draw.text((10, 47), f"Val: {key_val[:10]}...", font=theme.tiny_font, fill=WHITE)
+        for i, item in enumerate(key_action_menu):
+            y = 70 + i * 18
+            if i == app.ui.selected_index:
+                theme.widget(draw, (5, y, 122, y + 16), item, theme.small_font, None, BLACK, 5, (10, 2), ITEM_ICON)
+            else:
+                theme.widget(draw, (5, y, 122, y + 16), item, theme.small_font, GRAY, WHITE, 5, (10, 2))
+
+
+class JammingScreen(Screen):
+    def item_count(self, app):
+        return 2
+
+    def on_press(self, app):
+        if app.ui.selected_index == 0:
+            if app.jamming_active:
+                app.stop_jamming()
+            else:
+                app.stop_all_processes()
+                app.start_jamming()
+        elif app.ui.selected_index == 1:
+            if app.jamming_active:
+                app.stop_jamming()
+            app.ui.go("attack", 0)
+
+    def draw(self, app, draw):
+        theme = app.theme
+        selected = app.ui.selected_index
+        theme.header(draw, "Jamming")
+        if app.jamming_active:
+            theme.widget(draw, (5, 40, 127, 60), "Jamming Active", theme.font, None, LIGHT_BLUE, text_xy=(5, 0))
+            draw.ellipse((90, 35, 100, 45), fill=GREEN)  # Active indicator
+            theme.button(draw, (5, 100, 60, 116), "Stop", RED, selected == 0)
+        else:
+            theme.button(draw, (5, 50, 60, 66), "Start", GREEN, selected == 0)
+            theme.button(draw, (65, 50, 122, 66), "Exit", RED, selected == 1)
+
+
+class CaptureScreen(Screen):
+    def item_count(self, app):
+        return len(capture_menu)
+
+    def on_press(self, app):
+        ui = app.ui
+        if ui.selected_index == len(capture_menu) - 1:  # Exit
+            if app.capture_active:
+                app.stop_capture()
+            app.stop_all_processes()
+            ui.go(ui.previous_menu, 1)
+        elif app.capture_active:
+            if ui.selected_index == 0:  # Stop
+                app.stop_capture()
+                app.stop_all_processes()
+        else:
+            app.stop_all_processes()
+            # من قائمة Security المفتاح مفتاحك، فنحلل الضغطات ونعطي حكم fixed / rolling
+            app.start_capture(CAPTURE_BITS[ui.selected_index], audit=ui.previous_menu == "security")
+
+    def draw(self, app, draw):
+        theme = app.theme
+        if not app.capture_active:
+            theme.menu(draw, capture_menu, app.ui.selected_index)
+            return
+        theme.header(draw, "Capture RF")
+        if app.capture_verdict is not None:
+            theme.widget(draw, (10, 30, 127, 46), app.capture_verdict.label(), theme.tiny_font, None, LIGHT_BLUE,
+                         text_xy=(0, 2))
+        else:
+            theme.widget(draw, (10, 30, 127, 46), f"Capturing {app.capture_bit}", theme.small_font, None, LIGHT_BLUE,
+                         text_xy=(0, 0))
+        draw.ellipse((90, 25, 100, 35), fill=GREEN)  # Active indicator
+        theme.output_rows(draw, [message.label() for message in app.recent_outputs], 50)
+        theme.button(draw, (5, 100, 60, 116), "Stop", RED, app.ui.selected_index == 0)
+
+
+class WifiScreen(Screen):
+    def item_count(self, app):
+        return 2
+
+    def on_press(self, app):
+        if app.ui.selected_index == 1:
+            app.ui.go("main", 3)
+
+    def draw(self, app, draw):
+        theme = app.theme
+        theme.header(draw, "Wifi Test")
+        theme.button(draw, (5, 50, 60, 66), "Test Wifi", GREEN, app.ui.selected_index == 0)
+        theme.button(draw, (65, 50, 122, 66), "Exit", RED, app.ui.selected_index == 1)
+
+
+SCREENS = {
+    "main": MenuScreen(main_menu, [
+        open_menu("info"), open_menu("security"), open_menu("attack"), open_menu("wifi"), poweroff,
+    ]),
+    "security": MenuScreen(security_menu, [
+        open_jamming_detection, open_capture, open_page("rolling", security_menu[2]),
+        open_page("reuse_keys", REUSE_PAGE), open_menu("main", 1),
+    ]),
+    "attack": MenuScreen(attack_menu, [
+        open_menu("jamming"), open_capture, open_page("rolling", attack_menu[2]),
+        open_page("reuse_keys", REUSE_PAGE), open_menu("main", 2),
+    ]),
+    "info": InfoScreen(),
+    "jamming_detection": JammingDetectionScreen(),
+    "rolling": PlaceholderScreen(),
+    "reuse_keys": ReuseKeysScreen(),
+    "key_action": KeyActionScreen(),
+    "jamming": JammingScreen(),
+    "capture": CaptureScreen(),
+    "wifi": WifiScreen(),
+}
+
+
+def handle_event(app, event):
+    ui = app.ui
+    screen = SCREENS[ui.screen]
+    if event == UP:
+        ui.selected_index = max(0, ui.selected_index - 1)
+    elif event == DOWN:
+        ui.selected_index = min(screen.item_count(app) - 1, ui.selected_index + 1)
+    elif event == PRESS:
+        print(f"🔄 Current screen: {ui.screen}, selected_index: {ui.selected_index}")
+        screen.on_press(app)
+
+
+def draw_screen(app, draw):
+    SCREENS[app.ui.screen].draw(app, draw)
+
+
+def screen_state(app):
+    # كل ما يظهر على الشاشة؛ الرسم يصير فقط إذا تغيّر
+    ui = app.ui
+    return (ui.screen, ui.current_page, ui.selected_index, ui.selected_key,
+            app.jamming_active, app.jamming_detect_active, app.capture_active, app.capture_bit,
+            app.capture_verdict,
+            tuple(app.recent_outputs), app.key_cache.version)
@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from PIL import Image, ImageDraw
+
+MAX_SPRITES = 128
+
+
+class SpriteCache:
+    """Bounded LRU cache of pre-rendered widget tiles.
+
+    A tile is rasterized once per (kind, size, label, font, colours, ...) key
+    and then pasted into each frame, so static labels are not re-drawn with
+    TrueType on every redraw. Tiles are drawn on `background`, which must match
+    the page background because rounded corners leave it showing."""
+
+    def __init__(self, maxsize=MAX_SPRITES, mode="RGB", background=(0, 0, 0)):
+        self.maxsize = maxsize
+        self.mode = mode
+        self.background = background
+        self._tiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            self.hits += 1
+            return tile
+        self.misses += 1
+        tile = render()
+        self._tiles[key] = tile
+        if len(self._tiles) > self.maxsize:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def widget(self, size, label, font, fill, text_fill, radius=5, text_xy=(5, 2), icon=None):
+        key = ("widget", size, label, font, fill, text_fill, radius, text_xy, icon)
+        return self.get(key, lambda: self._render_widget(size, label, font, fill, text_fill, radius, text_xy, icon))
+
+    def header(self, size, title, font, fill, text_fill, text_xy=(5, 3)):
+        key = ("header", size, title, font, fill, text_fill, text_xy)
+        return self.get(key, lambda: self._render_header(size, title, font, fill, text_fill, text_xy))
+
+    def stats(self):
+        return {"size": len(self._tiles), "hits": self.hits, "misses": self.misses}
+
+    def _render_widget(self, size, label, font, fill, text_fill, radius, text_xy, icon):
+        tile = Image.new(self.mode, size, self.background)
+        draw = ImageDraw.Draw(tile)
+        if fill is not None:
+            draw.rounded_rectangle((0, 0, size[0] - 1, size[1] - 1), radius=radius, fill=fill)
+        if icon:
+            draw.polygon(icon, fill=text_fill)
+        draw.text(text_xy, label, font=font, fill=text_fill)
+        return tile
+
+    def _render_header(self, size, title, font, fill, text_fill, text_xy):
+        tile = Image.new(self.mode, size, fill)
+        ImageDraw.Draw(tile).text(text_xy, title, font=font, fill=text_fill)
+        return tile
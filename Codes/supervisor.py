@@ -0,0 +1,140 @@
+import queue
+import sys
+import threading
+import time
+from rf_messages import WorkerError, encode
+
+MAX_MESSAGES = 256
+
+
+class WorkerHandle:
+    def __init__(self, name, worker):
+        self.name = name
+        self.worker = worker
+        self.stop = threading.Event()
+        self.thread = None
+        self.started = time.monotonic()
+        self.last_message = None
+        self.messages = 0
+        self.dropped = 0
+        self.error = None
+
+
+class Supervisor:
+    """Runs the RF helpers as long-lived threads inside main.py.
+
+    A worker is any object with `run(stop, emit)`: it works until the `stop`
+    event is set and reports results with `emit(message)`, where message is
+    one of the rf_messages classes. Messages are tagged with the worker name
+    and put on `messages`, so the UI reads typed fields instead of parsing a
+    child's stdout, and switching modes is a thread start/join instead of a
+    python3 start-up and SIGINT."""
+
+    def __init__(self, maxsize=MAX_MESSAGES):
+        self.messages = queue.Queue(maxsize)
+        self._workers = {}
+        self._lock = threading.Lock()
+
+    def start(self, name, worker):
+        with self._lock:
+            handle = self._workers.get(name)
+            if handle is not None and handle.thread.is_alive():
+                return False
+            handle = WorkerHandle(name, worker)
+            handle.thread = threading.Thread(target=self._run, args=(handle,), name=name, daemon=True)
+            self._workers[name] = handle
+        handle.thread.start()
+        return True
+
+    def stop(self, name, timeout=5):
+        handle = self._workers.get(name)
+        if handle is None:
+            return True
+        handle.stop.set()
+        return self._join(handle, timeout)
+
+    def stop_all(self, timeout=5):
+        handles = list(self._workers.values())
+        for handle in handles:
+            handle.stop.set()
+        # كلهم يوقفون مع بعض، فالانتظار الكلي = أبطأ واحد
+        return all([self._join(handle, timeout) for handle in handles])
+
+    def is_running(self, name):
+        handle = self._workers.get(name)
+        return handle is not None and handle.thread.is_alive()
+
+    def drain(self):
+        items = []
+        try:
+            while True:
+                items.append(self.messages.get_nowait())
+        except queue.Empty:
+            pass
+        return items
+
+    def health(self):
+        now = time.monotonic()
+        return {
+            name: {
+                "alive": handle.thread.is_alive(),
+                "uptime": now - handle.started,
+                "messages": handle.messages,
+                "dropped": handle.dropped,
+                "idle": None if handle.last_message is None else now - handle.last_message,
+                "error": handle.error,
+            }
+            for name, handle in self._workers.items()
+        }
+
+    def _join(self, handle, timeout):
+        handle.thread.join(timeout)
+        if handle.thread.is_alive():
+            print(f"⚠️ Worker {handle.name} did not stop within {timeout}s")
+            return False
+        return True
+
+    def _run(self, handle):
+        def emit(message):
+            handle.messages += 1
+            handle.last_message = time.monotonic()
+            message.worker = handle.name
+            try:
+                self.messages.put_nowait(message)
+            except queue.Full:
+                handle.dropped += 1
+
+        try:
+            handle.worker.run(handle.stop, emit)
+        except Exception as e:
+            handle.error = str(e)
+            emit(WorkerError(f"⚠️ {handle.name}: {e}"))
+
+
+def run_cli(worker, ndjson=False):
+    """Run one worker in the foreground until Ctrl+C, printing each message's
+    label, or with `ndjson` writing the messages as NDJSON for another
+    program to read with rf_messages.read_messages()."""
+    stop = threading.Event()
+
+    def emit(message):
+        if ndjson:
+            sys.stdout.buffer.write(encode(message))
+            sys.stdout.buffer.flush()
+        else:
+            print(message.label(), flush=True)
+
+    def run():
+        try:
+            worker.run(stop, emit)
+        except Exception as e:
+            emit(WorkerError(f"❌ {e}"))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(0.5)
+    except KeyboardInterrupt:
+        stop.set()
+        thread.join()
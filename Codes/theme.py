@@ -0,0 +1,74 @@
+from PIL import ImageFont
+from sprites import SpriteCache
+
+# الألوان
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+BLUE = (0, 120, 255)
+GRAY = (50, 50, 50)
+DARK_GRAY = (30, 30, 30)
+LIGHT_BLUE = (100, 180, 255)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+
+MENU_ICON = ((3, 8), (7, 12), (3, 16))
+ITEM_ICON = ((3, 6), (7, 10), (3, 14))
+ROW_ICON = ((3, 5), (7, 9), (3, 13))
+
+
+def load_fonts():
+    try:
+        return (
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 14),
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12),
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 10),
+        )
+    except IOError:
+        default = ImageFont.load_default()
+        return default, default, default
+
+
+class Theme:
+    """Fonts plus the sprite-cached widgets every page is built from."""
+
+    def __init__(self, sprites=None):
+        self.font, self.small_font, self.tiny_font = load_fonts()
+        self.sprites = sprites or SpriteCache()
+
+    def header(self, draw, title):
+        draw.paste(self.sprites.header((128, 21), title, self.font, DARK_GRAY, WHITE), (0, 0))
+
+    def widget(self, draw, box, label, item_font, fill, text_fill, radius=5, text_xy=(5, 2), icon=None):
+        size = (box[2] - box[0] + 1, box[3] - box[1] + 1)
+        draw.paste(self.sprites.widget(size, label, item_font, fill, text_fill, radius, text_xy, icon), box[:2])
+
+    def button(self, draw, box, label, fill, selected):
+        if selected:
+            self.widget(draw, box, label, self.small_font, fill, BLACK)
+        else:
+            self.widget(draw, box, label, self.small_font, GRAY, WHITE)
+
+    def menu(self, draw, items, selected):
+        self.header(draw, "Menu")
+        for i, item in enumerate(items):
+            y = 25 + i * 22
+            if i == selected:
+                self.widget(draw, (5, y, 122, y + 20), item, self.small_font, LIGHT_BLUE, BLACK, 5, (10, 3), MENU_ICON)
+            else:
+                self.widget(draw, (5, y, 122, y + 20), item, self.small_font, GRAY, WHITE, 5, (10, 3))
+
+    def key_rows(self, draw, saved_keys, selected):
+        for i, (kar_name, key) in enumerate(saved_keys):
+            y = 30 + i * 15
+            label = f"{kar_name}: {key[:10]}..."
+            if i == selected:
+                self.widget(draw, (5, y, 122, y + 14), label, self.tiny_font, LIGHT_BLUE, BLACK, 3, (10, 2), ROW_ICON)
+            else:
+                self.widget(draw, (5, y, 122, y + 14), label, self.tiny_font, GRAY, WHITE, 3, (10, 2))
+
+    def output_rows(self, draw, outputs, top):
+        # المخرجات تتغير كل مرة، فما تنحفظ في الكاش
+        for i, output in enumerate(outputs):
+            y = top + i * 15
+            draw.rounded_rectangle((5, y, 122, y + 15), radius=3, fill=GRAY)
+            draw.text((10, y + 2), output[:20], font=self.tiny_font, fill=WHITE)
@@ -0,0 +1,207 @@
+import mmap
+import queue
+import struct
+import threading
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TICK_MASK = 0xFFFFFFFF
+MAGIC = b"RFTRACE1"
+VERSION = 1
+CHUNK_MAGIC = b"CHNK"
+CHUNK_RECORDS = 4096
+
+# File header: magic, version, record size, gpio
+FILE_HEADER = struct.Struct("<8sHHI")
+# Chunk header: magic, record count, absolute tick of the first record, wall-clock time of it
+CHUNK_HEADER = struct.Struct("<4sIId")
+# Record: µs since the previous event (0 for the first one in the file), pigpio level (0, 1, 2=TIMEOUT)
+RECORD = struct.Struct("<IB")
+RECORD_DTYPE = np.dtype([("delta", "<u4"), ("level", "u1")]) if np is not None else None
+
+
+class TraceWriter:
+    """Streams pigpio (level, tick) events into a binary trace file.
+
+    Layout: one FILE_HEADER, then chunks of CHUNK_HEADER followed by `count`
+    fixed 5-byte RECORDs. `record()` has the pigpio callback signature and
+    only appends to in-memory arrays; full chunks are packed and written by a
+    background thread, so the callback never waits on the SD card. A crash
+    loses at most the chunk being filled."""
+
+    def __init__(self, path, gpio=0, chunk_records=CHUNK_RECORDS):
+        self.path = path
+        self.chunk_records = chunk_records
+        self.records = 0
+        self.chunks = 0
+        self._file = open(path, "wb")
+        self._file.write(FILE_HEADER.pack(MAGIC, VERSION, RECORD.size, gpio))
+        self._last_tick = None
+        self._new_chunk()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    def record(self, gpio, level, tick):
+        if self._last_tick is None:
+            delta = 0
+        else:
+            delta = (tick - self._last_tick) & TICK_MASK
+        self._last_tick = tick
+        if not self._levels:
+            self._first_tick = tick
+            self._first_time = time.time()
+        self._deltas.append(delta)
+        self._levels.append(level)
+        if len(self._levels) >= self.chunk_records:
+            self._flush()
+
+    def close(self):
+        if self._file is None:
+            return
+        if self._levels:
+            self._flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _new_chunk(self):
+        self._deltas = array("L")
+        self._levels = bytearray()
+        self._first_tick = 0
+        self._first_time = 0.0
+
+    def _flush(self):
+        self._queue.put((self._first_tick, self._first_time, self._deltas, self._levels))
+        self.records += len(self._levels)
+        self.chunks += 1
+        self._new_chunk()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            first_tick, first_time, deltas, levels = item
+            self._file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, len(levels), first_tick, first_time))
+            self._file.write(pack_records(deltas, levels))
+            self._file.flush()
+
+
+def pack_records(deltas, levels):
+    if np is not None:
+        records = np.empty(len(levels), RECORD_DTYPE)
+        records["delta"] = deltas
+        records["level"] = np.frombuffer(bytes(levels), np.uint8)
+        return records.tobytes()
+    out = bytearray(RECORD.size * len(levels))
+    for i, (delta, level) in enumerate(zip(deltas, levels)):
+        RECORD.pack_into(out, i * RECORD.size, delta, level)
+    return bytes(out)
+
+
+class TraceReader:
+    """Read-only, memory-mapped view of a trace file.
+
+    Opening only walks the chunk headers; records are read straight out of
+    the mapping (as numpy views when numpy is installed), so a multi-hour
+    capture costs no more RAM than the chunk being looked at. A chunk cut
+    short by a crash is read up to its last complete record."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self.gpio = FILE_HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not an RF trace file")
+        if version > VERSION:
+            self.close()
+            raise ValueError(f"{path} is trace version {version}, this reader knows {VERSION}")
+        self.version = version
+        self.chunks = self._scan()
+
+    def _scan(self):
+        chunks = []
+        offset = FILE_HEADER.size
+        size = len(self._map)
+        while offset + CHUNK_HEADER.size <= size:
+            magic, count, first_tick, first_time = CHUNK_HEADER.unpack_from(self._map, offset)
+            if magic != CHUNK_MAGIC:
+                print(f"⚠️ Corrupt chunk header at byte {offset} of {self.path}, ignoring the rest")
+                break
+            data = offset + CHUNK_HEADER.size
+            count = min(count, (size - data) // RECORD.size)
+            chunks.append((data, count, first_tick, first_time))
+            offset = data + count * RECORD.size
+        return chunks
+
+    def __len__(self):
+        return sum(chunk[1] for chunk in self.chunks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # numpy views are still alive; the mapping goes when they do
+                pass
+            self._map = None
+        self._file.close()
+
+    def duration(self):
+        """Seconds covered by the trace, summed from the tick deltas."""
+        total = 0
+        for i in range(len(self.chunks)):
+            deltas = self.chunk_deltas(i)
+            total += int(deltas.sum()) if np is not None else sum(deltas)
+        return total / 1e6
+
+    def chunk_records(self, index):
+        """Records of one chunk: a numpy (delta, level) view, or a list of tuples."""
+        data, count, first_tick, first_time = self.chunks[index]
+        if np is not None:
+            return np.frombuffer(self._map, RECORD_DTYPE, count, data)
+        return list(RECORD.iter_unpack(self._map[data:data + count * RECORD.size]))
+
+    def chunk_deltas(self, index):
+        records = self.chunk_records(index)
+        if np is not None:
+            return records["delta"]
+        return [delta for delta, level in records]
+
+    def iter_chunks(self):
+        """Yield (first_tick, first_time, records) per chunk."""
+        for i, (data, count, first_tick, first_time) in enumerate(self.chunks):
+            yield first_tick, first_time, self.chunk_records(i)
+
+    def events(self):
+        """Yield every (tick, level) in order, with absolute pigpio ticks."""
+        for first_tick, first_time, records in self.iter_chunks():
+            tick = first_tick
+            first = True
+            for delta, level in records:
+                if first:
+                    first = False
+                else:
+                    tick = (tick + int(delta)) & TICK_MASK
+                yield tick, int(level)
@@ -0,0 +1,237 @@
+import sys
+
+from trace_file import TraceReader
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TIMEOUT = 2
+# level of the marker that only closes the last run
+END = -1
+WIDTH = 1600
+# لين هذا العدد من الـ segments في النافذة نرسم الموجة بالضبط بدل الـ min/max
+EXACT_LIMIT = 4 * WIDTH
+CSV_BLOCK = 65536
+
+
+def trace_runs(path):
+    """Yield (starts, levels) blocks from a binary trace: µs since the first
+    event and the level that holds from there on. Watchdog TIMEOUTs don't
+    change the line, so they are dropped and the previous level runs on."""
+    reader = TraceReader(path)
+    try:
+        offset = 0
+        for first_tick, first_time, records in reader.iter_chunks():
+            if np is not None:
+                starts = np.cumsum(records["delta"], dtype=np.int64) + offset
+                if len(starts):
+                    offset = int(starts[-1])
+                levels = records["level"]
+                edges = levels != TIMEOUT
+                yield starts[edges], levels[edges]
+            else:
+                starts, levels = [], []
+                for delta, level in records:
+                    offset += delta
+                    if level != TIMEOUT:
+                        starts.append(offset)
+                        levels.append(level)
+                yield starts, levels
+        yield [offset], [END]
+    finally:
+        reader.close()
+
+
+def csv_runs(path):
+    """Yield (starts, levels) blocks from rf_sniffer's `duration,level` CSV,
+    CSV_BLOCK lines at a time."""
+    offset = 0
+    starts, levels = [], []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            duration, level = line.split(",")
+            starts.append(offset)
+            levels.append(int(level))
+            offset += int(duration)
+            if len(starts) >= CSV_BLOCK:
+                yield starts, levels
+                starts, levels = [], []
+    yield starts + [offset], levels + [END]
+
+
+def open_runs(path):
+    return csv_runs(path) if path.endswith(".csv") else trace_runs(path)
+
+
+def total_duration(path):
+    if path.endswith(".csv"):
+        with open(path) as f:
+            return sum(int(line.split(",")[0]) for line in f if line.strip())
+    with TraceReader(path) as reader:
+        return round(reader.duration() * 1e6)
+
+
+class Envelope:
+    """Min/max level per pixel column over [start, end) µs.
+
+    Each run of one level marks the columns it covers with a +1/-1 pair in a
+    difference array, so a block of runs costs O(runs) and memory stays
+    O(width) however long the trace is. While there are at most
+    `exact_limit` runs in the window they are also kept as-is, so short
+    windows are drawn exactly instead of as an envelope."""
+
+    def __init__(self, start, end, width=WIDTH, exact_limit=EXACT_LIMIT):
+        self.start = start
+        self.end = end
+        self.width = width
+        self.scale = width / (end - start)
+        self.exact_limit = exact_limit
+        if np is not None:
+            self.high = np.zeros(width + 1, np.int64)
+            self.low = np.zeros(width + 1, np.int64)
+        else:
+            self.high = [0] * (width + 1)
+            self.low = [0] * (width + 1)
+        self.runs = 0
+        self.exact = ([], [])
+        self._pending = None
+
+    def add(self, starts, levels):
+        """Add a block of run starts; the last run ends where the next block starts."""
+        if np is not None:
+            starts = np.asarray(starts, np.int64)
+            levels = np.asarray(levels, np.int64)
+            if self._pending is not None:
+                starts = np.concatenate(([self._pending[0]], starts))
+                levels = np.concatenate(([self._pending[1]], levels))
+        elif self._pending is not None:
+            starts = [self._pending[0]] + list(starts)
+            levels = [self._pending[1]] + list(levels)
+        if not len(starts):
+            return
+        self._pending = (int(starts[-1]), int(levels[-1]))
+        if len(starts) > 1:
+            self._add_runs(starts[:-1], levels[:-1], starts[1:])
+
+    def done(self):
+        # الـ runs مرتبة؛ بعد نهاية النافذة ما في داعي نكمل
+        return self._pending is not None and self._pending[0] >= self.end
+
+    def _add_runs(self, starts, levels, ends):
+        if np is not None:
+            s = np.clip(starts, self.start, self.end)
+            e = np.clip(ends, self.start, self.end)
+            keep = e > s
+            s, e, levels = s[keep], e[keep], levels[keep]
+            c0 = ((s - self.start) * self.scale).astype(np.int64)
+            c1 = ((e - 1 - self.start) * self.scale).astype(np.int64) + 1
+            for level, diff in ((1, self.high), (0, self.low)):
+                m = levels == level
+                diff += np.bincount(c0[m], minlength=self.width + 1)
+                diff -= np.bincount(c1[m], minlength=self.width + 1)
+            self._keep_exact(s, levels)
+            return
+        kept_s, kept_l = [], []
+        for s, level, e in zip(starts, levels, ends):
+            s, e = max(s, self.start), min(e, self.end)
+            if e <= s:
+                continue
+            diff = self.high if level else self.low
+            diff[int((s - self.start) * self.scale)] += 1
+            diff[int((e - 1 - self.start) * self.scale) + 1] -= 1
+            kept_s.append(s)
+            kept_l.append(level)
+        self._keep_exact(kept_s, kept_l)
+
+    def _keep_exact(self, starts, levels):
+        self.runs += len(starts)
+        if self.exact is None:
+            return
+        if self.runs > self.exact_limit:
+            self.exact = None
+            return
+        self.exact[0].extend(int(s) for s in starts)
+        self.exact[1].extend(int(level) for level in levels)
+
+    def columns(self):
+        """(x µs, min, max) per column; min/max are None where no data falls."""
+        xs, lows, highs = [], [], []
+        high = low = 0
+        for i in range(self.width):
+            high += int(self.high[i])
+            low += int(self.low[i])
+            xs.append(self.start + (i + 0.5) / self.scale)
+            if not high and not low:
+                lows.append(None)
+                highs.append(None)
+            else:
+                lows.append(0 if low else 1)
+                highs.append(1 if high else 0)
+        return xs, lows, highs
+
+
+def build_envelope(path, start=None, end=None, width=WIDTH):
+    if start is None:
+        start = 0
+    if end is None:
+        end = total_duration(path)
+    envelope = Envelope(start, max(end, start + 1), width)
+    for starts, levels in open_runs(path):
+        envelope.add(starts, levels)
+        if envelope.done():
+            break
+    return envelope
+
+
+def plot(envelope, title="RF Signal", output=None):
+    import matplotlib
+    if output:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    if not envelope.runs:
+        exit("❌ No edges in that part of the trace")
+    fig, ax = plt.subplots(figsize=(envelope.width / 100, 3), dpi=100)
+    if envelope.exact is not None:
+        starts, levels = envelope.exact
+        ax.step([s / 1000 for s in starts] + [envelope.end / 1000], levels + levels[-1:], where="post")
+        mode = f"{envelope.runs} runs"
+    else:
+        xs, lows, highs = envelope.columns()
+        xs = [x / 1000 for x in xs]
+        lows = [float("nan") if v is None else v for v in lows]
+        highs = [float("nan") if v is None else v for v in highs]
+        ax.fill_between(xs, lows, highs, step="mid", linewidth=0.6, edgecolor="C0")
+        mode = f"{envelope.runs} runs, min/max per column"
+    ax.set_title(f"{title} ({mode})")
+    ax.set_xlabel("Time (ms)")
+    ax.set_ylabel("Level")
+    ax.set_ylim(-0.1, 1.1)
+    ax.grid(True)
+    if output:
+        fig.savefig(output, bbox_inches="tight")
+        print(f"💾 Saved {output}")
+    else:
+        plt.show()
+
+
+if __name__ == "__main__":
+    # الاستخدام: python3 trace_viewer.py TRACE.rft|signal.csv [START_MS END_MS] [--png FILE]
+    args = sys.argv[1:]
+    output = None
+    if "--png" in args:
+        i = args.index("--png")
+        if i + 1 >= len(args):
+            exit("❌ --png needs a file name")
+        output = args.pop(i + 1)
+        args.pop(i)
+    if not args:
+        exit("❌ Usage: python3 trace_viewer.py TRACE [START_MS END_MS] [--png FILE]")
+    start = end = None
+    if len(args) >= 3:
+        start, end = int(float(args[1]) * 1000), int(float(args[2]) * 1000)
+    plot(build_envelope(args[0], start, end), args[0], output)
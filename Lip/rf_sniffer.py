@@ -1,30 +1,10 @@
-import matplotlib.pyplot as plt
+import os
+import sys
 
-# حمّل البيانات من ملف
-times = []
-levels = []
+# الرسم صار في Codes/trace_viewer.py: يقرأ signal.csv أو ملف trace سطر بسطر
+# ويرسم min/max لكل عمود بدل ما يفرد كل µs في list
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Codes"))
+from trace_viewer import build_envelope, plot
 
-with open("signal.csv") as f:
-    for line in f:
-        t, l = line.strip().split(",")
-        times.append(int(t))
-        levels.append(int(l))
-
-# حوّلها إلى شكل موجي
-signal = []
-time_axis = []
-current_time = 0
-
-for i in range(len(times)):
-    duration = times[i]
-    level = levels[i]
-    signal.extend([level] * duration)
-    time_axis.extend([current_time + j for j in range(duration)])
-    current_time += duration
-
-plt.plot(time_axis, signal)
-plt.title("RF Signal")
-plt.xlabel("Time (μs)")
-plt.ylabel("Level")
-plt.grid(True)
-plt.show()
+path = sys.argv[1] if len(sys.argv) > 1 else "signal.csv"
+plot(build_envelope(path), "RF Signal")